@@ -1,11 +1,19 @@
 from __future__ import annotations
 import os
+import sqlite3
 import time
-import pandas as pd
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import TYPE_CHECKING
 from dotenv import load_dotenv
 
+if TYPE_CHECKING:
+    import pandas as pd
+    from src.connectors.qbo_client import QBOClient
+
 # --- 1. INITIALIZE ENVIRONMENT ---
-load_dotenv("config/secrets.env")
+if not os.environ.get("QBO_ENV_LOADED"):
+    load_dotenv("config/secrets.env")
+    os.environ["QBO_ENV_LOADED"] = "1"
 
 try:
     import pip_system_certs.wrappers
@@ -13,16 +21,79 @@ try:
 except ImportError:
     pass
 
-from src.connectors.gsheets_client import GSheetsClient
-from src.connectors.qbo_client import QBOClient
+# Heavy deps (pandas, the gspread/google stack) are imported lazily inside
+# delete_by_ids and __main__ so merely loading this module stays cheap.
 from src.utils.logger import setup_logger
 
 logger = setup_logger("master_bulk_delete")
 
+class _SyncTokenStore:
+    """sqlite-backed SyncToken cache keyed by (realm, entity, id).
+
+    Persists across runs, so delete/re-sync cycles over the same IDs skip
+    the SELECT prefetch entirely. Entries expire after ttl_sec.
+    """
+
+    def __init__(self, path: str = "cache/qbo_tokens.db", ttl_sec: int = 24 * 3600):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.ttl_sec = ttl_sec
+        self.conn = sqlite3.connect(path, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS tokens ("
+            " realm TEXT NOT NULL, entity TEXT NOT NULL, id TEXT NOT NULL,"
+            " sync_token TEXT NOT NULL, last_seen INTEGER NOT NULL,"
+            " PRIMARY KEY (realm, entity, id))"
+        )
+
+    def get_many(self, realm: str, entity: str, ids: list[str]) -> dict[str, str]:
+        cutoff = int(time.time()) - self.ttl_sec
+        out: dict[str, str] = {}
+        chunk_size = 500  # stay under sqlite's bound-variable limit
+        for i in range(0, len(ids), chunk_size):
+            chunk = ids[i : i + chunk_size]
+            marks = ",".join("?" * len(chunk))
+            rows = self.conn.execute(
+                f"SELECT id, sync_token FROM tokens"
+                f" WHERE realm=? AND entity=? AND last_seen>=? AND id IN ({marks})",
+                [realm, entity, cutoff, *chunk],
+            ).fetchall()
+            out.update(rows)
+        return out
+
+    def put_many(self, realm: str, entity: str, items: list[dict]) -> None:
+        now = int(time.time())
+        self.conn.executemany(
+            "INSERT INTO tokens (realm, entity, id, sync_token, last_seen)"
+            " VALUES (?,?,?,?,?)"
+            " ON CONFLICT(realm, entity, id) DO UPDATE SET"
+            " sync_token=excluded.sync_token, last_seen=excluded.last_seen",
+            [(realm, entity, str(it['Id']), str(it['SyncToken']), now) for it in items],
+        )
+
+    def delete_many(self, realm: str, entity: str, ids: list[str]) -> None:
+        chunk_size = 500
+        for i in range(0, len(ids), chunk_size):
+            chunk = ids[i : i + chunk_size]
+            marks = ",".join("?" * len(chunk))
+            self.conn.execute(
+                f"DELETE FROM tokens WHERE realm=? AND entity=? AND id IN ({marks})",
+                [realm, entity, *chunk],
+            )
+
 class QBOMasterDeleter:
     def __init__(self, client: QBOClient):
         self.client = client
-        self.request_delay = 0.5  # Pacing to avoid connection drops
+        self.max_workers = 8  # Concurrent QBO requests (bounded to respect QBO limits)
+        # Persistent SyncToken cache: retry runs (even in a fresh process)
+        # skip the SELECT phase for IDs already seen recently.
+        self._tokens = _SyncTokenStore()
+
+    def _fetch_chunk(self, chunk: list[str], entity_type: str) -> list[dict]:
+        """Fetches Id + SyncToken for one chunk of IDs."""
+        formatted_ids = ", ".join([f"'{x}'" for x in chunk])
+        query = f"SELECT Id, SyncToken FROM {entity_type} WHERE Id IN ({formatted_ids})"
+        return self.client.query(query)
 
     def delete_by_ids(self, id_list: list[str], entity_type: str) -> pd.DataFrame:
         """
@@ -30,29 +101,44 @@ class QBOMasterDeleter:
         1. Fetches the required 'SyncToken' for each ID.
         2. Sends a batch delete request.
         """
+        # Imported here so just loading this script (e.g. for --help) stays fast.
+        import pandas as pd
+
         clean_ids = [str(x).strip() for x in id_list if str(x).strip()]
         if not clean_ids:
             logger.warning("⚠️ No IDs provided.")
             return pd.DataFrame()
 
-        logger.info(f"🔍 Fetching SyncTokens for {len(clean_ids)} {entity_type}(s)...")
-        
-        # --- Step 1: Get SyncTokens ---
-        valid_items = []
-        chunk_size = 40  # QBO Query limit is usually safe around 40-50 for simple selects
-        
-        for i in range(0, len(clean_ids), chunk_size):
-            chunk = clean_ids[i : i + chunk_size]
-            formatted_ids = ", ".join([f"'{x}'" for x in chunk])
-            
-            # Query QBO to confirm ID exists and get current SyncToken
-            query = f"SELECT Id, SyncToken FROM {entity_type} WHERE Id IN ({formatted_ids})"
-            
-            try:
-                data = self.client.query(query)
-                valid_items.extend(data)
-            except Exception as e:
-                logger.error(f"❌ Failed to fetch metadata for chunk {i}: {e}")
+        # --- Step 1: Get SyncTokens (cached first, missing chunks fetched concurrently) ---
+        realm = str(self.client.realm_id)
+        cached = self._tokens.get_many(realm, entity_type, clean_ids)
+        valid_items = [{"Id": x, "SyncToken": cached[x]} for x in clean_ids if x in cached]
+        missing_ids = [x for x in clean_ids if x not in cached]
+
+        if valid_items:
+            logger.info(f"♻️ Reusing cached SyncTokens for {len(valid_items)} {entity_type}(s).")
+
+        if missing_ids:
+            logger.info(f"🔍 Fetching SyncTokens for {len(missing_ids)} {entity_type}(s)...")
+
+            chunk_size = 40  # QBO Query limit is usually safe around 40-50 for simple selects
+            chunks = [missing_ids[i : i + chunk_size] for i in range(0, len(missing_ids), chunk_size)]
+
+            # Warm the access token once so worker threads don't race the refresh.
+            self.client.get_access_token()
+
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                future_map = {
+                    executor.submit(self._fetch_chunk, chunk, entity_type): i * chunk_size
+                    for i, chunk in enumerate(chunks)
+                }
+                for future in as_completed(future_map):
+                    try:
+                        fetched = future.result()
+                        self._tokens.put_many(realm, entity_type, fetched)
+                        valid_items.extend(fetched)
+                    except Exception as e:
+                        logger.error(f"❌ Failed to fetch metadata for chunk {future_map[future]}: {e}")
 
         if not valid_items:
             logger.error("❌ No matching records found in QBO. Check your IDs and Entity Type.")
@@ -60,48 +146,102 @@ class QBOMasterDeleter:
 
         logger.info(f"✅ Found {len(valid_items)} valid items. Starting Deletion...")
 
-        # --- Step 2: Execute Batch Delete ---
-        results = []
-        
+        # --- Step 2: Execute Batch Delete (batches posted concurrently) ---
+        # Column-oriented result buffers: one DataFrame construction at the
+        # end, no per-row dict allocation or schema inference.
+        ids_col: list[str] = []
+        status_col: list[str] = []
+
         # Batch size for deletion (max 25-30 per request recommended)
-        batch_size = 25 
-        
-        for i in range(0, len(valid_items), batch_size):
-            batch = valid_items[i : i + batch_size]
+        batch_size = 25
+        batches = [valid_items[i : i + batch_size] for i in range(0, len(valid_items), batch_size)]
+
+        def _delete_batch(batch: list[dict], allow_retry: bool = True) -> list[tuple[str, str]]:
+            """Posts one batch delete and returns per-item (id, status) pairs.
+
+            A 200 from /batch can still carry per-item Fault elements, so each
+            BatchItemResponse is matched back by bId instead of assuming the
+            whole batch succeeded. Stale-token faults (likely with cached
+            SyncTokens) get one retry with freshly fetched tokens.
+            """
             batch_req = { "BatchItemRequest": [] }
-            
-            for idx, item in enumerate(batch):
+            for item in batch:
                 batch_req["BatchItemRequest"].append({
                     "bId": f"del_{item['Id']}",
                     "operation": "delete",
-                    entity_type: { 
-                        "Id": item['Id'], 
-                        "SyncToken": item['SyncToken'] 
+                    entity_type: {
+                        "Id": item['Id'],
+                        "SyncToken": item['SyncToken']
                     }
                 })
-            
-            try:
-                endpoint = f"/v3/company/{self.client.realm_id}/batch"
-                self.client.post(endpoint, batch_req)
-                
-                # If no exception, assume success for this batch
-                for item in batch:
-                    logger.info(f"   🗑️ Deleted ID: {item['Id']}")
-                    results.append({"Id": item['Id'], "Type": entity_type, "Status": "Deleted"})
-                    
-            except Exception as e:
-                logger.error(f"   ❌ Batch failed: {e}")
-                for item in batch:
-                    results.append({"Id": item['Id'], "Type": entity_type, "Status": f"Error: {e}"})
-            
-            time.sleep(self.request_delay)
-            
-        return pd.DataFrame(results)
+
+            endpoint = f"/v3/company/{self.client.realm_id}/batch"
+            resp = self.client.post(endpoint, batch_req)
+            by_bid = {r.get('bId'): r for r in resp.get('BatchItemResponse', [])}
+
+            results: list[tuple[str, str]] = []
+            done_ids: list[str] = []  # deleted or faulted: token is no longer valid
+            stale: list[str] = []
+            for item in batch:
+                item_id = str(item['Id'])
+                fault = (by_bid.get(f"del_{item_id}") or {}).get('Fault')
+                if not fault:
+                    logger.info(f"   🗑️ Deleted ID: {item_id}")
+                    results.append((item_id, "Deleted"))
+                    done_ids.append(item_id)
+                    continue
+                error = (fault.get('Error') or [{}])[0]
+                message = error.get('Message', 'Unknown fault')
+                done_ids.append(item_id)
+                if allow_retry and (error.get('code') == '5010' or 'stale' in message.lower()):
+                    stale.append(item_id)
+                else:
+                    logger.error(f"   ❌ Delete failed for ID {item_id}: {message}")
+                    results.append((item_id, f"Error: {message}"))
+
+            # Deleted tokens are single-use; faulted ones are stale either way.
+            self._tokens.delete_many(realm, entity_type, done_ids)
+
+            if stale:
+                logger.info(f"   🔄 Retrying {len(stale)} item(s) with fresh SyncTokens...")
+                try:
+                    fresh = self._fetch_chunk(stale, entity_type)
+                except Exception as e:
+                    logger.error(f"   ❌ SyncToken re-fetch failed: {e}")
+                    results.extend((x, f"Error: {e}") for x in stale)
+                    return results
+                self._tokens.put_many(realm, entity_type, fresh)
+                results.extend(_delete_batch(fresh, allow_retry=False))
+                refetched = {str(it['Id']) for it in fresh}
+                results.extend(
+                    (x, "Error: Record not found on retry fetch") for x in stale if x not in refetched
+                )
+            return results
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            future_map = {executor.submit(_delete_batch, batch): batch for batch in batches}
+            for future in as_completed(future_map):
+                batch = future_map[future]
+                try:
+                    for item_id, status in future.result():
+                        ids_col.append(item_id)
+                        status_col.append(status)
+                except Exception as e:
+                    logger.error(f"   ❌ Batch failed: {e}")
+                    ids_col.extend(str(item['Id']) for item in batch)
+                    status_col.extend(f"Error: {e}" for _ in batch)
+                    # Drop possibly-stale tokens so a retry re-fetches them.
+                    self._tokens.delete_many(realm, entity_type, [str(item['Id']) for item in batch])
+
+        return pd.DataFrame({"Id": ids_col, "Type": entity_type, "Status": status_col})
 
 # ==========================================
 # CONFIGURATION & RUN
 # ==========================================
 if __name__ == "__main__":
+    from src.connectors.gsheets_client import GSheetsClient
+    from src.connectors.qbo_client import QBOClient
+
     gs = GSheetsClient()
     qbo = QBOClient(gs_client=gs)
 
@@ -0,0 +1,11 @@
+import os
+
+# Production entrypoint for the webhook server:
+#   gunicorn -c gunicorn.conf.py server:app
+# Multiple OS processes handle webhooks in parallel instead of Werkzeug's
+# single-process dev server; threads cover the cheap JSON/auth parse path.
+bind = "0.0.0.0:8000"
+workers = (2 * (os.cpu_count() or 1)) + 1
+threads = 4
+worker_class = "gthread"
+timeout = 60
@@ -10,13 +10,20 @@ except ImportError:
     pass
 # --------------------------------------------
 
+import os
 from dotenv import load_dotenv
-load_dotenv("config/secrets.env")
+if not os.environ.get("QBO_ENV_LOADED"):
+    load_dotenv("config/secrets.env")
+    os.environ["QBO_ENV_LOADED"] = "1"
 
 import calendar
 import re
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
+from functools import lru_cache
 from typing import Tuple, List, Dict
+import numpy as np
 import pandas as pd
 from config import settings
 from src.connectors.gsheets_client import GSheetsClient
@@ -29,36 +36,68 @@ from src.utils.run_lock import single_instance_lock
 
 logger = setup_logger("ingestion")
 
+# How long fetched QBO mappings stay valid per realm within one process run.
+MAPPINGS_CACHE_TTL_SEC = 600
+
+# Compiled once; matched against Remarks columns on every retry scan.
+ERROR_REMARKS_RE = re.compile(r"ERROR|Unbalance", re.IGNORECASE)
+ERROR_RE = re.compile(r"ERROR", re.IGNORECASE)
+
+# Month labels already in output form ("Mar 25") skip re-parsing entirely.
+MONTH_LABEL_RE = re.compile(r"[A-Za-z]{3} \d{2}")
+
 def parse_mixed_date(series: pd.Series) -> pd.Series:
     """Parse Excel serial dates and regular date strings safely."""
     numeric = pd.to_numeric(series, errors="coerce")
-    excel_mask = numeric.between(-60000, 120000)
+    excel_mask = numeric.between(-60000, 120000).to_numpy()
 
-    parsed = pd.Series(pd.NaT, index=series.index, dtype="datetime64[ns]")
+    # Single preallocated output array; no mask-based .loc assignment.
+    parsed = np.full(len(series), np.datetime64("NaT"), dtype="datetime64[ns]")
     if excel_mask.any():
-        parsed.loc[excel_mask] = pd.to_datetime(
-            numeric.loc[excel_mask],
-            origin="1899-12-30",
-            unit="D",
-            errors="coerce",
+        # Excel serial = days since 1899-12-30; convert arithmetically in one pass.
+        days = numeric.to_numpy(dtype="float64")[excel_mask]
+        parsed[excel_mask] = (
+            np.datetime64("1899-12-30", "ns") + (days * 86400e9).astype("timedelta64[ns]")
         )
-    if (~excel_mask).any():
-        parsed.loc[~excel_mask] = pd.to_datetime(series.loc[~excel_mask], errors="coerce")
-    return parsed
+    if not excel_mask.all():
+        parsed[~excel_mask] = pd.to_datetime(
+            series.to_numpy()[~excel_mask], errors="coerce"
+        ).values
+    return pd.Series(parsed, index=series.index)
 
 # ==========================================
 # 1. HELPER FUNCTIONS
 # ==========================================
 
+def _parse_month_start(month_str: str) -> datetime | None:
+    """Parses a month label into the first day of that month.
+
+    Tries the cheap strptime formats the control sheet actually uses before
+    falling back to pandas' general parser.
+    """
+    s = str(month_str).strip()
+    for fmt in ("%b %Y", "%B %Y", "%Y-%m", "%b %y"):
+        try:
+            dt = datetime.strptime(s, fmt)
+            return datetime(dt.year, dt.month, 1)
+        except ValueError:
+            continue
+    try:
+        dt = pd.to_datetime(s)
+        return datetime(dt.year, dt.month, 1)
+    except Exception:
+        return None
+
 def get_month_date_range(month_str: str, last_month_date_val=None) -> Tuple[datetime, datetime]:
     """Builds [start, end] date range for a month.
     Start is always first day of month; end uses 'Last Month Date' when provided.
     """
     try:
-        dt = pd.to_datetime(month_str)
-        start_date = dt.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        start_date = _parse_month_start(month_str)
+        if start_date is None:
+            return None, None
         _, last_day = calendar.monthrange(start_date.year, start_date.month)
-        month_end = start_date.replace(day=last_day, hour=23, minute=59, second=59, microsecond=999999)
+        month_end = datetime(start_date.year, start_date.month, last_day, 23, 59, 59, 999999)
 
         if pd.isna(last_month_date_val) or str(last_month_date_val).strip() == "":
             return start_date, month_end
@@ -84,21 +123,34 @@ def _now_iso_local() -> str:
     now = datetime.now().astimezone()
     return now.strftime(f"%Y-%m-%d %H:%M:%S")
 
+@lru_cache(maxsize=64)
+def _header_index_map(columns: tuple) -> dict[str, int]:
+    """Header name -> 1-based column index, cached per header layout."""
+    return {name: i + 1 for i, name in enumerate(columns)}
+
 def _batch_update_control(gs, sheet_id, tab_name, row_num, columns, updates_dict):
     """Updates specific columns for a row in the Control Sheet."""
-    headers = list(columns)
+    col_map = _header_index_map(tuple(columns))
     batch_data = []
     for col_name, val in updates_dict.items():
-        if col_name in headers:
-            col_idx = headers.index(col_name) + 1
+        col_idx = col_map.get(col_name)
+        if col_idx:
             batch_data.append({'row': row_num, 'col': col_idx, 'val': str(val)})
     if batch_data:
-        gs.batch_update_cells(sheet_id, tab_name, batch_data)
+        gs.batch_update_cells(sheet_id, tab_name, batch_data, value_input_option="RAW")
 
 def format_month_name(date_str: str) -> str:
     if not date_str: return ""
+    s = str(date_str).strip()
+    if MONTH_LABEL_RE.fullmatch(s):
+        return s
+    for fmt in ("%b %Y", "%B %Y"):
+        try:
+            return datetime.strptime(s, fmt).strftime("%b %y")
+        except ValueError:
+            pass
     try:
-        return pd.to_datetime(date_str).strftime("%b %y")
+        return pd.to_datetime(s).strftime("%b %y")
     except:
         return date_str
 
@@ -129,6 +181,12 @@ def _cap_pending_nos(vals: set[int], max_processed_no: int) -> set[int]:
 
 def _safe_int(val) -> int:
     """Coerce sheet values like 1234, 1234.0, '1,234' into int safely."""
+    # Fast paths: UNFORMATTED_VALUE reads hand back real numbers.
+    if isinstance(val, int):
+        return val
+    if isinstance(val, float):
+        return 0 if val != val else int(val)  # NaN check without pd.isna
+
     try:
         if pd.isna(val):
             return 0
@@ -144,6 +202,13 @@ def _safe_int(val) -> int:
     except Exception:
         return 0
 
+def _stringify_dt(df: pd.DataFrame) -> pd.DataFrame:
+    """Renders datetime columns as YYYY-MM-DD strings in one assign pass."""
+    dt_cols = df.columns[[str(dt).startswith("datetime") for dt in df.dtypes]]
+    if not len(dt_cols):
+        return df
+    return df.assign(**{c: df[c].dt.strftime("%Y-%m-%d") for c in dt_cols})
+
 def _get_successfully_processed_nos(gs: GSheetsClient, spreadsheet_url: str, tabs: list[str]) -> set[int]:
     """
     Returns set of raw 'No' values that already exist in any output tab
@@ -161,7 +226,7 @@ def _get_successfully_processed_nos(gs: GSheetsClient, spreadsheet_url: str, tab
 
         df_tmp = df_out.copy()
         if "Remarks" in df_tmp.columns:
-            err_mask = df_tmp["Remarks"].astype(str).str.contains("ERROR|Unbalance", case=False, na=False)
+            err_mask = df_tmp["Remarks"].astype(str).str.contains(ERROR_REMARKS_RE, na=False)
             df_tmp = df_tmp[~err_mask]
 
         if df_tmp.empty:
@@ -173,16 +238,17 @@ def _get_successfully_processed_nos(gs: GSheetsClient, spreadsheet_url: str, tab
     return processed
 
 def get_retry_context(
-    gs: GSheetsClient,
-    spreadsheet_url: str,
+    df: pd.DataFrame,
     tab_name: str,
     id_col_name: str,
     include_doc_id_match: bool = True,
 ) -> Tuple[List[int], Dict[int, str]]:
-    """Identifies rows marked as 'ERROR' in the Transform file to re-process them."""
+    """Identifies rows marked as 'ERROR' in the Transform file to re-process them.
+
+    Expects a DataFrame read positionally (read_as_df/batch_read_as_df) so the
+    index stays aligned with sheet rows.
+    """
     try:
-        # Use read_as_df to keep row positions aligned with sheet rows.
-        df = gs.read_as_df(spreadsheet_url, tab_name)
         if df.empty or "Remarks" not in df.columns or id_col_name not in df.columns:
             return [], {}
 
@@ -193,7 +259,7 @@ def get_retry_context(
         work_df["_no"] = pd.to_numeric(work_df.get("No"), errors="coerce")
 
         # Any row flagged as error/unbalanced should trigger full cleanup for its document/no.
-        error_mask = work_df["_remarks"].str.contains("ERROR|Unbalance", case=False, na=False)
+        error_mask = work_df["_remarks"].str.contains(ERROR_REMARKS_RE, na=False)
         bad_rows = work_df[error_mask]
         if bad_rows.empty:
             return [], {}
@@ -220,16 +286,12 @@ def get_retry_context(
             return [], {}
 
         rows_to_delete = sorted(target_df["_sheet_row"].astype(int).unique().tolist(), reverse=True)
-        existing_id_map = {}
 
-        for _, row in target_df.iterrows():
-            try:
-                s_no = int(float(str(row.get("No", ""))))
-                doc_id = str(row.get(id_col_name, "")).strip()
-                if s_no > 0 and doc_id:
-                    existing_id_map[s_no] = doc_id
-            except Exception:
-                pass
+        # Vectorized No -> doc id map (already coerced above; no per-row parsing).
+        map_nos = target_df["_no"].fillna(0).astype(int)
+        map_ids = target_df["_doc_id"]
+        valid_mask = (map_nos > 0) & (map_ids != "")
+        existing_id_map = dict(zip(map_nos[valid_mask].tolist(), map_ids[valid_mask].tolist()))
 
         return rows_to_delete, existing_id_map
     except Exception as e:
@@ -268,6 +330,7 @@ def process_client_control_sheet(
     control_sheet_id: str,
     client_name: str,
     realm_id: str,
+    mappings_cache: dict | None = None,
 ):
     """
     Reads the specific Client's Control Sheet and processes all 'READY' jobs.
@@ -288,6 +351,19 @@ def process_client_control_sheet(
     # Normalize headers to avoid silent misses from extra spaces/newlines.
     ctrl_df.columns = [" ".join(str(c).replace("\n", " ").split()) for c in ctrl_df.columns]
 
+    # Strip the job-detail string columns once, vectorized, so the row loop
+    # below can use the values as-is instead of str(...).strip() per field.
+    for c in (
+        settings.CTRL_COL_ACTIVE,
+        settings.CTRL_COL_COUNTRY,
+        settings.CTRL_COL_SOURCE_URL,
+        settings.CTRL_COL_TRANSFORM_URL,
+        settings.CTRL_COL_TAB_NAME,
+        settings.CTRL_COL_MONTH,
+    ):
+        if c in ctrl_df.columns:
+            ctrl_df[c] = ctrl_df[c].fillna("").astype(str).str.strip()
+
     # Avoid expensive QBO auth/mapping calls when this client has nothing to run.
     status_series = ctrl_df.get(settings.CTRL_COL_ACTIVE, pd.Series("", index=ctrl_df.index))
     ready_count = int(status_series.astype(str).str.strip().eq("READY").sum())
@@ -306,8 +382,15 @@ def process_client_control_sheet(
 
     # --- C. Fetch QBO Mappings (Specific to this Client/Realm) ---
     try:
-        temp_sync = QBOSync(qbo_client)
-        qbo_mappings = temp_sync.mappings
+        cached = None if mappings_cache is None else mappings_cache.get(realm_id)
+        if cached and time.time() - cached[0] < MAPPINGS_CACHE_TTL_SEC:
+            qbo_mappings = cached[1]
+            logger.info(f"   ♻️ [{client_name}] Reusing cached QBO mappings for Realm {realm_id}.")
+        else:
+            temp_sync = QBOSync(qbo_client)
+            qbo_mappings = temp_sync.mappings
+            if mappings_cache is not None:
+                mappings_cache[realm_id] = (time.time(), qbo_mappings)
         num_accounts = len(qbo_mappings.get('accounts', {}))
         num_locations = len(qbo_mappings.get('locations', {}))
         logger.info(f"   ✅ [{client_name}] QBO Mappings fetched: {num_accounts} accounts, {num_locations} locations.")
@@ -326,26 +409,46 @@ def process_client_control_sheet(
     COL_QBO_TR = "QBO Transfer"
     COL_PENDING_AMOUNT_NOS = "Pending Amount Nos"
 
+    # Pre-typed numeric counter columns: one coercion pass up front instead
+    # of _safe_int calls per row inside the loop. reindex tolerates sheets
+    # that miss a column (filled as 0).
+    num_ctrl_cols = [settings.CTRL_COL_LAST_PROCESSED_ROW, COL_LAST_JV, COL_LAST_EXP, COL_LAST_TR]
+    ctrl_nums = (
+        ctrl_df.reindex(columns=num_ctrl_cols)
+        .apply(pd.to_numeric, errors="coerce")
+        .fillna(0)
+        .astype("int64")
+    )
+
     # Get the max journal number currently recorded in the sheet
-    global_last_jv = ctrl_df[COL_LAST_JV].apply(_safe_int).max()
+    global_last_jv = int(ctrl_nums[COL_LAST_JV].max())
 
     # --- D. Iterate Control Sheet Rows ---
-    for i, row in ctrl_df.iterrows():
+    # to_dict("records") materializes plain dicts once (keeps .get() access)
+    # instead of building a dtype-coerced Series per row like iterrows().
+    # zip with the index keeps sheet row numbers right when blank rows were
+    # dropped at read time.
+    for i, row in zip(ctrl_df.index, ctrl_df.to_dict("records")):
         # 1. Check Trigger
-        status_val = str(row.get(settings.CTRL_COL_ACTIVE, "")).strip()
+        status_val = row.get(settings.CTRL_COL_ACTIVE, "")
         if status_val != 'READY': continue
 
         row_num = i + 2
         logger.info(f"🚀 [{client_name}] Processing Row {row_num}...")
         _batch_update_control(gs, control_sheet_id, settings.CONTROL_TAB_NAME, row_num, ctrl_df.columns, {settings.CTRL_COL_ACTIVE: "PROCESSING"})
 
+        # Non-urgent control-sheet writes accumulate here and flush in one
+        # batch call at the end of the row (or on error). Only the PROCESSING
+        # marker above goes out immediately, to signal other runners.
+        pending_updates: dict = {}
+
         try:
-            # 2. Extract Job Details
-            country = str(row.get(settings.CTRL_COL_COUNTRY, "")).strip()
-            source_url = str(row.get(settings.CTRL_COL_SOURCE_URL, "")).strip()
-            transform_url = str(row.get(settings.CTRL_COL_TRANSFORM_URL, "")).strip()
-            raw_tab_name = str(row.get(settings.CTRL_COL_TAB_NAME, "")).strip()
-            raw_month = str(row.get(settings.CTRL_COL_MONTH, "")).strip()
+            # 2. Extract Job Details (columns were stripped before the loop)
+            country = row.get(settings.CTRL_COL_COUNTRY, "")
+            source_url = row.get(settings.CTRL_COL_SOURCE_URL, "")
+            transform_url = row.get(settings.CTRL_COL_TRANSFORM_URL, "")
+            raw_tab_name = row.get(settings.CTRL_COL_TAB_NAME, "")
+            raw_month = row.get(settings.CTRL_COL_MONTH, "")
             last_month_date = row.get(settings.CTRL_COL_LAST_MONTH_DATE, "")
             month = format_month_name(raw_month)
 
@@ -360,14 +463,14 @@ def process_client_control_sheet(
                     # Copy permissions from the Client's Control Sheet to the new Transform File
                     gs.copy_permissions(source_id=control_sheet_id, target_id=new_file_id)
                     
-                    _batch_update_control(gs, control_sheet_id, settings.CONTROL_TAB_NAME, row_num, ctrl_df.columns, {settings.CTRL_COL_TRANSFORM_URL: transform_url})
+                    pending_updates[settings.CTRL_COL_TRANSFORM_URL] = transform_url
                     created_new_transform = True
                 except Exception as e:
                     logger.error(f"   ❌ Failed to create spreadsheet: {e}")
                     raise e
             
             # 4. Prepare ID Counters
-            last_processed = _safe_int(row.get(settings.CTRL_COL_LAST_PROCESSED_ROW, 0))
+            last_processed = int(ctrl_nums.at[i, settings.CTRL_COL_LAST_PROCESSED_ROW])
             
             # Fetch latest QBO Journal No to prevent overlap.
             client_lower = client_name.lower()
@@ -380,8 +483,8 @@ def process_client_control_sheet(
             qbo_last_jv = qbo_client.get_max_journal_number(journal_prefix)
             final_start_jv = max(global_last_jv, qbo_last_jv)
             
-            last_exp = _safe_int(row.get(COL_LAST_EXP, 0))
-            last_tr = _safe_int(row.get(COL_LAST_TR, 0))
+            last_exp = int(ctrl_nums.at[i, COL_LAST_EXP])
+            last_tr = int(ctrl_nums.at[i, COL_LAST_TR])
             previous_pending_nos = _cap_pending_nos(
                 _parse_no_set(row.get(COL_PENDING_AMOUNT_NOS, "")),
                 last_processed
@@ -404,42 +507,63 @@ def process_client_control_sheet(
             # 5. Build retry context from existing transform ERROR rows.
             preserved_ids = {'journals': {}, 'expenses': {}, 'transfers': {}}
             deletions: Dict[str, List[int]] = {}
-            retry_nos: list[int] = []
+            retry_nos: set[int] = set()
 
             # Retry by raw No only (avoid broad doc-id expansion).
+            # All three tabs come back in a single batchGet round trip.
+            retry_dfs = gs.batch_read_as_df(transform_url, [tab_jv, tab_exp, tab_tr])
+
             d_jv, ids_jv = get_retry_context(
-                gs, transform_url, tab_jv, "Journal No", include_doc_id_match=False
+                retry_dfs[tab_jv], tab_jv, "Journal No", include_doc_id_match=False
             )
             if d_jv:
                 deletions[tab_jv] = d_jv
                 preserved_ids['journals'] = ids_jv
 
             d_exp, ids_exp = get_retry_context(
-                gs, transform_url, tab_exp, "Exp Ref. No", include_doc_id_match=False
+                retry_dfs[tab_exp], tab_exp, "Exp Ref. No", include_doc_id_match=False
             )
             if d_exp:
                 deletions[tab_exp] = d_exp
                 preserved_ids['expenses'] = ids_exp
 
             d_tr, ids_tr = get_retry_context(
-                gs, transform_url, tab_tr, "Ref No", include_doc_id_match=False
+                retry_dfs[tab_tr], tab_tr, "Ref No", include_doc_id_match=False
             )
             if d_tr:
                 deletions[tab_tr] = d_tr
                 preserved_ids['transfers'] = ids_tr
 
-            retry_nos = list(set([k for sub in preserved_ids.values() for k in sub.keys()]))
+            # Union the key views directly; no intermediate list or rehash.
+            retry_nos = set().union(*(sub.keys() for sub in preserved_ids.values()))
 
             # 6. Read & Clean Source Data
             source_header_row = 5 if "kzdw" in client_name.lower() else 1
+            # Legacy layouts only ever use the first 26 columns, so project the
+            # read to A:Z. KZP/KZDW locate named columns that may sit further
+            # right, so they still fetch the full tab.
+            raw_range = None if ("kzp" in client_lower or "kzdw" in client_lower) else "A:Z"
             raw_df = gs.read_as_df(
                 source_url,
                 raw_tab_name,
                 header_row=source_header_row,
-                value_render_option='UNFORMATTED_VALUE'
+                value_render_option='UNFORMATTED_VALUE',
+                range_a1=raw_range,
             )
             raw_df = standardize_raw_df(raw_df, client_name=client_name, raw_month=raw_month)
 
+            # Opt-in: Arrow-backed columns make the str.contains/isin/numeric
+            # passes below cheaper on very wide months. Off by default since
+            # pyarrow is not a hard dependency of this project.
+            if os.getenv("RAW_DF_ARROW_BACKEND", "0") == "1":
+                try:
+                    import pyarrow  # noqa: F401
+                    raw_df = raw_df.convert_dtypes(dtype_backend="pyarrow")
+                except ImportError:
+                    logger.warning(
+                        f"   ⚠️ [{client_name}] RAW_DF_ARROW_BACKEND=1 but pyarrow is not installed; keeping NumPy dtypes."
+                    )
+
             # --- LOGGING START ---
             initial_count = len(raw_df)
             logger.info(f"   📊 [{client_name}] Step 6: Raw Rows Read: {initial_count}")
@@ -447,7 +571,8 @@ def process_client_control_sheet(
 
             if raw_df.empty:
                 logger.info(f"   [{client_name}] Raw tab empty.")
-                _batch_update_control(gs, control_sheet_id, settings.CONTROL_TAB_NAME, row_num, ctrl_df.columns, {settings.CTRL_COL_ACTIVE: "DONE (Empty)"})
+                pending_updates[settings.CTRL_COL_ACTIVE] = "DONE (Empty)"
+                _batch_update_control(gs, control_sheet_id, settings.CONTROL_TAB_NAME, row_num, ctrl_df.columns, pending_updates)
                 continue
             
             # Keep canonical raw schema from raw_adapter (supports KZDW Currency Rate).
@@ -459,12 +584,16 @@ def process_client_control_sheet(
             target_start, target_end = get_month_date_range(raw_month, last_month_date)
             if target_start and target_end:
                 # Robust Parse
-                raw_df["_TempDate"] = parse_mixed_date(raw_df["Date"])
-                
-                # Filter
-                month_mask = (raw_df["_TempDate"] >= target_start) & (raw_df["_TempDate"] <= target_end)
+                temp_dates = parse_mixed_date(raw_df["Date"])
+
+                # Filter. Comparing as int64 nanoseconds is one fused NumPy
+                # pass with no per-element Timestamp boxing; NaT (int64 min)
+                # naturally falls outside the window.
+                date_ns = temp_dates.to_numpy(dtype="datetime64[ns]").view("i8")
+                lo = pd.Timestamp(target_start).value
+                hi = pd.Timestamp(target_end).value
+                month_mask = (date_ns >= lo) & (date_ns <= hi)
                 raw_df = raw_df[month_mask].copy()
-                raw_df.drop(columns=["_TempDate"], inplace=True)
                 
                 # --- LOGGING DATE FILTER ---
                 after_date_count = len(raw_df)
@@ -478,17 +607,22 @@ def process_client_control_sheet(
 
                 if raw_df.empty:
                     logger.warning(f"   [{client_name}] ⚠️ No rows found for {month} in Source.")
-                    _batch_update_control(gs, control_sheet_id, settings.CONTROL_TAB_NAME, row_num, ctrl_df.columns, {settings.CTRL_COL_ACTIVE: "DONE (No Data)"})
+                    pending_updates[settings.CTRL_COL_ACTIVE] = "DONE (No Data)"
+                    _batch_update_control(gs, control_sheet_id, settings.CONTROL_TAB_NAME, row_num, ctrl_df.columns, pending_updates)
                     continue
 
             # 8. Numeric Cleanup (Do this first so we can check for 0 amounts)
-            for col in ["No", "USD - QBO", "Amount Fr", "Amount To"]:
-                if col in raw_df.columns:
-                    raw_df[col] = pd.to_numeric(raw_df[col], errors="coerce").fillna(0)
+            # One assign instead of per-column writes; "No" lands as int64 so
+            # the selection masks below compare machine ints, not float64.
+            num_cols = ["No", "USD - QBO", "Amount Fr", "Amount To"]
+            raw_df = raw_df.assign(**{
+                col: pd.to_numeric(raw_df[col], errors="coerce").fillna(0).astype("int64" if col == "No" else "float64")
+                for col in num_cols if col in raw_df.columns
+            })
 
             # 9. Exclude Rows
             before_exclude = len(raw_df)
-            raw_df = raw_df[~raw_df["Check (Internal use)"].astype(str).str.contains("exclude", na=False, case=False)].copy()
+            raw_df = raw_df[~raw_df["Check (Internal use)"].astype("string").str.lower().str.contains("exclude", na=False, regex=False)].copy()
 
             after_exclude = len(raw_df)
             dropped_exclude = before_exclude - after_exclude
@@ -510,31 +644,32 @@ def process_client_control_sheet(
 
             # ---> B. Identify Ready Rows (Method exists, and amount is NOT 0)
             ready_mask = method_non_blank & (amt_numeric != 0)
-            ready_df = raw_df[ready_mask].copy()
 
             # 10a. Strictly new rows (No > last_processed)
-            new_df = ready_df[ready_df["No"] > last_processed].copy()
+            new_mask = ready_mask & (raw_df["No"] > last_processed)
 
             # 10b. Always retry rows listed in Pending Amount Nos.
-            late_filled_df = raw_df[
+            late_filled_mask = (
                 (raw_df["No"] <= last_processed) &
                 (raw_df["No"].isin(previous_pending_nos)) &
                 method_non_blank
-            ].copy()
+            )
 
             # 10c. Always retry old ERROR rows from transform outputs.
-            retry_df = raw_df[
-                raw_df["No"].isin(retry_nos) &
-                method_non_blank
-            ].copy()
+            retry_nos_arr = np.fromiter(retry_nos, dtype=np.int64, count=len(retry_nos))
+            retry_mask = pd.Series(
+                np.isin(raw_df["No"].to_numpy(), retry_nos_arr), index=raw_df.index
+            ) & method_non_blank
 
+            # Single selection pass over raw_df; no concat copies to dedupe.
             processing_df = (
-                pd.concat([new_df, late_filled_df, retry_df])
-                  .drop_duplicates(subset=["No"])
+                raw_df[new_mask | late_filled_mask | retry_mask]
+                .drop_duplicates(subset=["No"])
+                .copy()
             )
 
             # --- LOGGING SELECTION ---
-            no_numeric = pd.to_numeric(raw_df["No"], errors="coerce").fillna(0).astype(int)
+            no_numeric = raw_df["No"]  # already int64 from Step 8
             no_method_count = int((~method_non_blank).sum())
             zero_amount_count = int((method_non_blank & (amt_numeric == 0)).sum())
             positive_amt_count = int((method_non_blank & (amt_numeric != 0)).sum())
@@ -545,8 +680,8 @@ def process_client_control_sheet(
                  (method_non_blank & (amt_numeric != 0))).sum()
             )
             logger.info(
-                f"   🔢 [{client_name}] Step 10: Selection -> New: {len(new_df)}, "
-                f"Late-filled: {len(late_filled_df)}, Retry: {len(retry_df)} | "
+                f"   🔢 [{client_name}] Step 10: Selection -> New: {int(new_mask.sum())}, "
+                f"Late-filled: {int(late_filled_mask.sum())}, Retry: {int(retry_mask.sum())} | "
                 f"Total: {len(processing_df)}"
             )
             logger.info(
@@ -559,18 +694,17 @@ def process_client_control_sheet(
             if processing_df.empty:
                 logger.info(f"   [{client_name}] No new rows to process.")
                 pending_to_write = _cap_pending_nos(current_pending_nos, last_processed)
-                _batch_update_control(gs, control_sheet_id, settings.CONTROL_TAB_NAME, row_num, ctrl_df.columns, {
-                    settings.CTRL_COL_LAST_RUN_AT: _now_iso_local(), 
+                pending_updates.update({
+                    settings.CTRL_COL_LAST_RUN_AT: _now_iso_local(),
                     COL_PENDING_AMOUNT_NOS: _serialize_no_set(pending_to_write), # <-- ADDED
                     settings.CTRL_COL_ACTIVE: "DONE"
                 })
+                _batch_update_control(gs, control_sheet_id, settings.CONTROL_TAB_NAME, row_num, ctrl_df.columns, pending_updates)
                 continue
 
             # Delete only rows that are actually being retried from ERROR state.
             retry_selected_nos = set(
-                int(x)
-                for x in pd.to_numeric(retry_df.get("No"), errors="coerce").dropna().astype(int).tolist()
-                if int(x) > 0
+                int(x) for x in raw_df.loc[retry_mask, "No"].tolist() if x > 0
             )
             deletions = {}
             if retry_selected_nos:
@@ -599,30 +733,25 @@ def process_client_control_sheet(
             # Note: We use 'control_sheet_id' as the template source. 
             # Assumes the Client's Control Sheet has the "Sample - Journals" etc. hidden tabs.
             
-            def write_tab(df_out, tab_out, templ_name):
-                if not df_out.empty:
-                    # Fix dates for JSON serialization
-                    for col in df_out.select_dtypes(include=['datetime64', 'datetimetz']).columns:
-                        df_out[col] = df_out[col].dt.strftime('%Y-%m-%d')
-                    
-                    gs.append_or_create_df(
-                        transform_url, 
-                        tab_out, 
-                        df_out, 
-                        template_tab_name=templ_name, 
-                        template_spreadsheet_id=control_sheet_id
-                    )
-
-            write_tab(result.journals, tab_jv, "Sample - Journals")
-            write_tab(result.expenses, tab_exp, "Sample - Expenses")
-            write_tab(result.withdraw, tab_tr, "Sample - Transfers")
+            # All three tabs go out through one metadata pass and one batched
+            # write. Dates are stringified for JSON serialization (one assign,
+            # no repeated select_dtypes scan or per-column copies).
+            gs.append_or_create_dfs(
+                transform_url,
+                [
+                    (tab_jv, _stringify_dt(result.journals), "Sample - Journals"),
+                    (tab_exp, _stringify_dt(result.expenses), "Sample - Expenses"),
+                    (tab_tr, _stringify_dt(result.withdraw), "Sample - Transfers"),
+                ],
+                template_spreadsheet_id=control_sheet_id,
+            )
 
             gs.cleanup_default_sheet(transform_url)
 
             # 14. Check Status of Output (Any errors generated by Transformer?)
             def check_status(df):
                 if df.empty: return ""
-                if "Remarks" in df.columns and df["Remarks"].astype(str).str.contains("ERROR", case=False, na=False).any(): return "ERROR"
+                if "Remarks" in df.columns and df["Remarks"].astype(str).str.contains(ERROR_RE, na=False).any(): return "ERROR"
                 return "READY TO SYNC"
 
             status_jv = check_status(result.journals)
@@ -633,7 +762,8 @@ def process_client_control_sheet(
             final_last_row = max(last_processed, result.max_row_processed) if result.max_row_processed else last_processed
             pending_to_write = _cap_pending_nos(current_pending_nos, final_last_row)
 
-            updates = {
+            updates = pending_updates
+            updates.update({
                 settings.CTRL_COL_LAST_PROCESSED_ROW: final_last_row,
                 COL_LAST_JV: result.last_journal_no,
                 COL_LAST_EXP: result.last_expense_no,
@@ -641,7 +771,7 @@ def process_client_control_sheet(
                 COL_PENDING_AMOUNT_NOS: _serialize_no_set(pending_to_write), # <-- ADDED
                 settings.CTRL_COL_LAST_RUN_AT: _now_iso_local(),
                 settings.CTRL_COL_ACTIVE: "DONE"
-            }
+            })
             if COL_QBO_JV in ctrl_df.columns: updates[COL_QBO_JV] = status_jv
             if COL_QBO_EXP in ctrl_df.columns: updates[COL_QBO_EXP] = status_exp
             if COL_QBO_TR in ctrl_df.columns: updates[COL_QBO_TR] = status_tr
@@ -651,13 +781,15 @@ def process_client_control_sheet(
 
         except Exception as e:
             logger.error(f"❌ [{client_name}] Error processing row {row_num}: {e}")
-            _batch_update_control(gs, control_sheet_id, settings.CONTROL_TAB_NAME, row_num, ctrl_df.columns, {settings.CTRL_COL_ACTIVE: "ERROR"})
+            # Flush anything accumulated (e.g. a new Transform File URL) along with the error.
+            pending_updates[settings.CTRL_COL_ACTIVE] = "ERROR"
+            _batch_update_control(gs, control_sheet_id, settings.CONTROL_TAB_NAME, row_num, ctrl_df.columns, pending_updates)
             continue
 
 # ==========================================
 # 3. MAIN ENTRY POINT
 # ==========================================
-def _is_target_client(client_row: pd.Series, target_client: str | None) -> bool:
+def _is_target_client(client_row: dict, target_client: str | None) -> bool:
     if not target_client:
         return True
 
@@ -687,6 +819,35 @@ def _target_is_all(target_client: str | None) -> bool:
     t = settings.normalize_workspace_name(target_client)
     return t in {"", "all", "*", "all clients"}
 
+def _run_one_client(client_row: dict, mappings_cache: dict) -> None:
+    """Runs ingestion for one master-sheet row with its own API clients (thread-safe)."""
+    client_name = str(client_row.get(settings.MST_COL_CLIENT, "Unknown"))
+    sheet_id = str(client_row.get(settings.MST_COL_SHEET_ID, "")).strip()
+    realm_id = str(client_row.get(settings.MST_COL_REALM_ID, "")).strip()
+
+    print(f"🏢 STARTING CLIENT: {client_name}")
+    print(f"   Realm ID: {realm_id} | Sheet: {sheet_id}")
+
+    # QBOClient.set_company mutates shared state, so each worker gets its own clients.
+    gs = GSheetsClient()
+    qbo_client = QBOClient(gs_client=gs)
+
+    client_lock_name = f"run_ingestion_client_{realm_id}"
+    with single_instance_lock(client_lock_name) as client_acquired:
+        if not client_acquired:
+            logger.warning(
+                f"⏭️ Skipping {client_name}: another ingestion run is already processing Realm {realm_id}."
+            )
+            return
+        # Run Ingestion for this Client
+        try:
+            process_client_control_sheet(
+                gs, qbo_client, sheet_id, client_name, realm_id,
+                mappings_cache=mappings_cache,
+            )
+        except Exception as e:
+            logger.error(f"❌ Critical Logic Failure for {client_name}: {e}")
+
 def main(target_client: str | None = None):
     target_is_all = _target_is_all(target_client)
     dispatch_ctx = single_instance_lock("run_ingestion_all_dispatch") if target_is_all else nullcontext(True)
@@ -696,9 +857,6 @@ def main(target_client: str | None = None):
             return
 
         gs = GSheetsClient()
-        
-        # Initialize QBO Client with GSheets (to allow it to read/write tokens)
-        qbo_client = QBOClient(gs_client=gs)
 
         logger.info("🌍 Reading MASTER SHEET to find active clients...")
         
@@ -715,16 +873,19 @@ def main(target_client: str | None = None):
             logger.warning("Master sheet is empty.")
             return
 
-        # Loop through Clients
+        # Collect eligible clients, then run them concurrently (I/O-bound work).
         matched_clients = 0
-        for i, client_row in master_df.iterrows():
+        # QBO mappings fetched once per realm per run (realms can repeat across rows).
+        mappings_cache: dict[str, tuple[float, dict]] = {}
+        candidate_rows: list[dict] = []
+        for client_row in master_df.to_dict("records"):
             if not _is_target_client(client_row, target_client):
                 continue
             matched_clients += 1
 
             client_name = str(client_row.get(settings.MST_COL_CLIENT, "Unknown"))
             status = str(client_row.get(settings.MST_COL_STATUS, "")).strip()
-            
+
             # Filter Active Clients
             if status.lower() != "active":
                 continue
@@ -743,21 +904,26 @@ def main(target_client: str | None = None):
                 logger.warning(f"⚠️ Skipping {client_name}: Missing Sheet ID or Realm ID.")
                 continue
 
-            print(f"🏢 STARTING CLIENT: {client_name}")
-            print(f"   Realm ID: {realm_id} | Sheet: {sheet_id}")
+            candidate_rows.append(client_row)
 
-            client_lock_name = f"run_ingestion_client_{realm_id}"
-            with single_instance_lock(client_lock_name) as client_acquired:
-                if not client_acquired:
-                    logger.warning(
-                        f"⏭️ Skipping {client_name}: another ingestion run is already processing Realm {realm_id}."
-                    )
-                    continue
-                # Run Ingestion for this Client
-                try:
-                    process_client_control_sheet(gs, qbo_client, sheet_id, client_name, realm_id)
-                except Exception as e:
-                    logger.error(f"❌ Critical Logic Failure for {client_name}: {e}")
+        max_workers = max(1, _safe_int(os.getenv("INGESTION_CLIENT_WORKERS", "4")))
+        max_workers = min(max_workers, len(candidate_rows)) or 1
+        if max_workers == 1:
+            for client_row in candidate_rows:
+                _run_one_client(client_row, mappings_cache)
+        else:
+            logger.info(f"🧵 Running {len(candidate_rows)} client(s) with {max_workers} workers...")
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                future_map = {
+                    executor.submit(_run_one_client, client_row, mappings_cache):
+                        str(client_row.get(settings.MST_COL_CLIENT, "Unknown"))
+                    for client_row in candidate_rows
+                }
+                for future in as_completed(future_map):
+                    try:
+                        future.result()
+                    except Exception as e:
+                        logger.error(f"❌ Critical Logic Failure for {future_map[future]}: {e}")
 
         if target_client and matched_clients == 0:
             logger.warning(f"No client matched target '{target_client}'.")
@@ -9,10 +9,14 @@ except ImportError:
     pass
 
 from dotenv import load_dotenv
-load_dotenv("config/secrets.env")
+if not os.environ.get("QBO_ENV_LOADED"):
+    load_dotenv("config/secrets.env")
+    os.environ["QBO_ENV_LOADED"] = "1"
 
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
+from functools import lru_cache
 from config import settings
 from src.connectors.gsheets_client import GSheetsClient
 from src.connectors.qbo_client import QBOClient
@@ -26,52 +30,82 @@ RECONCILE_ENABLE_RAW_CHECK = str(os.getenv("RECONCILE_ENABLE_RAW_CHECK", "1")).s
     "0", "false", "no", "off"
 }
 
+@lru_cache(maxsize=64)
+def _header_index_map(columns: tuple) -> dict[str, int]:
+    """Header name -> 1-based column index, cached per header layout."""
+    return {name: i + 1 for i, name in enumerate(columns)}
+
 def _batch_update_control(gs, sheet_id, tab_name, row_num, columns, updates_dict):
     """Updates the Control Sheet."""
-    headers = list(columns)
+    col_map = _header_index_map(tuple(columns))
     batch_data = []
     for col_name, val in updates_dict.items():
-        if col_name in headers:
-            col_idx = headers.index(col_name) + 1
+        col_idx = col_map.get(col_name)
+        if col_idx:
             batch_data.append({'row': row_num, 'col': col_idx, 'val': str(val)})
     if batch_data:
-        gs.batch_update_cells(sheet_id, tab_name, batch_data)
+        gs.batch_update_cells(sheet_id, tab_name, batch_data, value_input_option="RAW")
+
+@lru_cache(maxsize=64)
+def _month_label(month_str: str) -> str:
+    """'Mon YY' tab label for a control-sheet month value.
+
+    Tries the cheap strptime formats the control sheet actually uses before
+    falling back to pandas' format-inferring parser. Cached: a run sees the
+    same handful of month values across many control rows.
+    """
+    s = str(month_str).strip()
+    for fmt in ("%b %Y", "%B %Y", "%Y-%m", "%b %y"):
+        try:
+            return datetime.strptime(s, fmt).strftime("%b %y")
+        except ValueError:
+            continue
+    return pd.to_datetime(s).strftime("%b %y")
+
+def _has_reconcile_issue(results: list[dict]) -> bool:
+    """True when any reconciler result reports a Mismatch/Missing status."""
+    if not results:
+        return False
+    statuses = pd.Series([r["status"] for r in results], dtype="object")
+    return bool(statuses.str.contains("Mismatch|Missing", regex=True, na=False).any())
 
 def write_reconcile_results(gs, spreadsheet_url, tab_name, df, updates_list):
     """Writes status to the detailed Transform file."""
     if not updates_list: return
     target_col_name = "Reconcile Status"
+    batch_payload = []
     if target_col_name in df.columns:
         col_idx = df.columns.get_loc(target_col_name) + 1
     else:
         col_idx = len(df.columns) + 1
-        gs.update_cell(spreadsheet_url, tab_name, 1, col_idx, target_col_name)
-    
-    batch_payload = []
+        # New column: ship the header cell with the status writes below.
+        batch_payload.append({"row": 1, "col": col_idx, "val": target_col_name})
+
     for item in updates_list:
         batch_payload.append({"row": item["row_idx"]+2, "col": col_idx, "val": item["status"]})
-    gs.batch_update_cells(spreadsheet_url, tab_name, batch_payload)
+    gs.batch_update_cells(spreadsheet_url, tab_name, batch_payload, value_input_option="RAW")
 
 def write_raw_check_results(gs, spreadsheet_url, tab_name, df, updates_list):
     """Writes 'Raw Status' to the Transform file."""
     if not updates_list: return
     target_col_name = "Raw Reconcile"
     
-    # Check if column exists, if not add it
+    # Check if column exists, if not add the header inside the same batch
+    # write instead of a separate update_cell round-trip.
+    batch_payload = []
     if target_col_name in df.columns:
         col_idx = df.columns.get_loc(target_col_name) + 1
     else:
         col_idx = len(df.columns) + 1
-        gs.update_cell(spreadsheet_url, tab_name, 1, col_idx, target_col_name)
-    
-    batch_payload = []
+        batch_payload.append({"row": 1, "col": col_idx, "val": target_col_name})
+
     for item in updates_list:
         # +2 offset for 0-index + header row
         batch_payload.append({"row": item["row_idx"]+2, "col": col_idx, "val": item["status"]})
     
     # print("Add Raw Reconcile")
     
-    gs.batch_update_cells(spreadsheet_url, tab_name, batch_payload)
+    gs.batch_update_cells(spreadsheet_url, tab_name, batch_payload, value_input_option="RAW")
 # ==============================================================================
 # LOGIC: PROCESS ONE CLIENT
 # ==============================================================================
@@ -99,7 +133,8 @@ def process_client_reconcile(
     COL_QBO_TR = "QBO Transfer"
 
     status_series = ctrl_df.get(CTRL_COL_RECONCILE, pd.Series("", index=ctrl_df.index))
-    reconcile_now_count = int(status_series.astype(str).str.strip().eq("RECONCILE NOW").sum())
+    reconcile_mask = status_series.astype(str).str.strip().eq("RECONCILE NOW")
+    reconcile_now_count = int(reconcile_mask.sum())
     if reconcile_now_count == 0:
         logger.info(f"   ⏭️ [{client_name}] No RECONCILE NOW rows. Skipping QBO auth.")
         return
@@ -115,34 +150,66 @@ def process_client_reconcile(
     # Initialize Reconciler
     reconciler = Reconciler(qbo_client)
 
-    for i, row in ctrl_df.iterrows():
-        status = str(row.get(CTRL_COL_RECONCILE, "")).strip()
-        if status != "RECONCILE NOW": continue
-
+    # Bind hot settings attributes to locals once; module attribute lookups
+    # are not free inside a per-row loop.
+    COL_COUNTRY = settings.CTRL_COL_COUNTRY
+    COL_TRANSFORM = settings.CTRL_COL_TRANSFORM_URL
+    COL_MONTH = settings.CTRL_COL_MONTH
+    COL_SOURCE = settings.CTRL_COL_SOURCE_URL
+    COL_TAB = settings.CTRL_COL_TAB_NAME
+    CONTROL_TAB = settings.CONTROL_TAB_NAME
+    TAB_JV_SUFFIX = settings.OUTPUT_TAB_JOURNALS
+    TAB_EXP_SUFFIX = settings.OUTPUT_TAB_EXPENSES
+    TAB_TR_SUFFIX = settings.OUTPUT_TAB_WITHDRAW
+
+    # Rows were prefiltered by the vectorized mask above; plain dicts instead
+    # of per-row Series, and zip with the index keeps sheet row numbers right
+    # when blank rows were dropped at read time.
+    work_df = ctrl_df[reconcile_mask]
+    for i, row in zip(work_df.index, work_df.to_dict("records")):
         row_num = i + 2
-        country = row.get(settings.CTRL_COL_COUNTRY)
-        transform_url = row.get(settings.CTRL_COL_TRANSFORM_URL)
-        month_str = str(row.get(settings.CTRL_COL_MONTH, ""))
+        country = row.get(COL_COUNTRY)
+        transform_url = row.get(COL_TRANSFORM)
+        month_str = str(row.get(COL_MONTH, ""))
         raw_month = month_str.strip()
 
         if not transform_url or not month_str or month_str.lower() == "nan":
-            _batch_update_control(gs, control_sheet_id, settings.CONTROL_TAB_NAME, row_num, ctrl_df.columns, {CTRL_COL_RECONCILE: "ERROR: Missing Info"})
+            _batch_update_control(gs, control_sheet_id, CONTROL_TAB, row_num, ctrl_df.columns, {CTRL_COL_RECONCILE: "ERROR: Missing Info"})
             continue
 
         logger.info(f"⚖️  [{client_name}] Reconciling {country}...")
-        _batch_update_control(gs, control_sheet_id, settings.CONTROL_TAB_NAME, row_num, ctrl_df.columns, {CTRL_COL_RECONCILE: "RUNNING..."})
+        # No RUNNING... write here: each row reconciles synchronously and the
+        # final status lands moments later, so the transient state only cost
+        # an extra write round trip per row.
 
         row_updates = {}
         has_issue = False
-        dt_label = pd.to_datetime(month_str).strftime("%b %y")
+        dt_label = _month_label(month_str)
         
+        tab_jv = f"{country} {dt_label} - {TAB_JV_SUFFIX}"
+        tab_exp = f"{country} {dt_label} - {TAB_EXP_SUFFIX}"
+        tab_tr = f"{country} {dt_label} - {TAB_TR_SUFFIX}"
+
+        # All three tabs arrive with one batchGet instead of a read per section.
+        try:
+            tab_dfs = gs.batch_read_as_df_sync(transform_url, [tab_jv, tab_exp, tab_tr])
+        except Exception as e:
+            logger.error(f"   ⚠️ Failed to batch-read transform tabs: {e}")
+            tab_dfs = {}
+
+        tabs_empty = all(df is None or df.empty for df in map(tab_dfs.get, (tab_jv, tab_exp, tab_tr)))
+
         # --- NEW: Fetch Raw Data for Comparison ---
-        source_url = row.get(settings.CTRL_COL_SOURCE_URL)
-        raw_tab_name = row.get(settings.CTRL_COL_TAB_NAME)
-        
+        # Read after the transform tabs: the raw source is the biggest payload
+        # of the iteration and is pointless when there is nothing to reconcile.
+        source_url = row.get(COL_SOURCE)
+        raw_tab_name = row.get(COL_TAB)
+
         raw_df = pd.DataFrame()
 
-        if RECONCILE_ENABLE_RAW_CHECK:
+        if RECONCILE_ENABLE_RAW_CHECK and tabs_empty:
+            logger.info(f"   ⏭️ [{client_name}] All transform tabs empty. Skipping Raw Source read.")
+        elif RECONCILE_ENABLE_RAW_CHECK:
             try:
                 if source_url and raw_tab_name:
                     logger.info(f"   📥 [{client_name}] Fetching Raw Source for Validation...")
@@ -166,104 +233,74 @@ def process_client_reconcile(
                         "Check (Internal use)", "No"
                     ]
                     
-                    # 8. Numeric Cleanup
-                    for col in ["No", "USD - QBO", "Amount Fr", "Amount To"]:
-                        if col in raw_df.columns:
-                            raw_df[col] = pd.to_numeric(raw_df[col], errors="coerce").fillna(0)
+                    # 8. Numeric Cleanup — one block assignment instead of a
+                    # to_numeric/fillna pass per column. The rename above
+                    # guarantees all four columns exist.
+                    num_cols = ["No", "USD - QBO", "Amount Fr", "Amount To"]
+                    raw_df[num_cols] = raw_df[num_cols].apply(pd.to_numeric, errors="coerce").fillna(0)
 
             except Exception as e:
                 logger.error(f"   ⚠️ Failed to read Raw Source: {e}")
         else:
             logger.info(f"   ⏭️ [{client_name}] Raw-vs-transform check disabled by RECONCILE_ENABLE_RAW_CHECK.")
 
-        # 1. Reconcile Journals
-        try:
-            tab = f"{country} {dt_label} - {settings.OUTPUT_TAB_JOURNALS}"
-            try: df = gs.read_as_df_sync(transform_url, tab)
-            except: df = pd.DataFrame()
+        # Key the raw frame once; all three sections compare against it.
+        raw_index = reconciler.prepare_raw_index(raw_df) if not raw_df.empty else {}
 
-            if not df.empty:
-                # A. QBO Reconcile (Existing)
-                res_qbo = reconciler.reconcile_journals(df, month_str)
-                write_reconcile_results(gs, transform_url, tab, df, res_qbo)
-                
-                # B. Raw vs Transform Reconcile (NEW)
-                if not raw_df.empty:
-                    # print("RUN")
-                    res_raw = reconciler.reconcile_raw_vs_transform(raw_df, df, "JournalEntry")
-                    write_raw_check_results(gs, transform_url, tab, df, res_raw)
-                
-                if any("Mismatch" in r["status"] or "Missing" in r["status"] for r in res_qbo):
-                    row_updates[COL_QBO_JV] = "QBO MISMATCH"
-                    has_issue = True
-                else:
-                    row_updates[COL_QBO_JV] = "SYNCED"
-        except Exception as e:
-            logger.error(f"   ❌ JV Reconcile Error: {e}")
-            has_issue = True
+        # Reconcile the three output tabs. Each section is an independent
+        # I/O-bound pipeline (QBO queries -> status write), so they run
+        # overlapped on a small thread pool.
+        def _reconcile_section(label, col_name, tab, reconcile_fn, qbo_entity):
+            """Reconciles one tab. Returns (col_name, status or None, issue_flag)."""
+            try:
+                df = tab_dfs.get(tab)
 
-        # 2. Reconcile Expenses
-        try:
-            tab = f"{country} {dt_label} - {settings.OUTPUT_TAB_EXPENSES}"
-            try: df = gs.read_as_df_sync(transform_url, tab)
-            except: df = pd.DataFrame()
+                if df is None or df.empty:
+                    return col_name, None, False
 
-            if not df.empty:
                 # A. QBO Reconcile
-                res_qbo = reconciler.reconcile_expenses(df, month_str)
+                res_qbo = reconcile_fn(df, month_str)
                 write_reconcile_results(gs, transform_url, tab, df, res_qbo)
-                
-                # B. Raw Check
-                if not raw_df.empty:
-                    res_raw = reconciler.reconcile_raw_vs_transform(raw_df, df, "Purchase")
-                    write_raw_check_results(gs, transform_url, tab, df, res_raw)
-                
-                if any("Mismatch" in r["status"] or "Missing" in r["status"] for r in res_qbo):
-                    row_updates[COL_QBO_EXP] = "QBO MISMATCH"
-                    has_issue = True
-                else:
-                    row_updates[COL_QBO_EXP] = "SYNCED"
-        except Exception as e:
-            logger.error(f"   ❌ Exp Reconcile Error: {e}")
-            has_issue = True
-
-        # 3. Reconcile Transfers
-        try:
-            tab = f"{country} {dt_label} - {settings.OUTPUT_TAB_WITHDRAW}"
-            try: df = gs.read_as_df_sync(transform_url, tab)
-            except: df = pd.DataFrame()
 
-            if not df.empty:
-                # A. QBO Reconcile
-                res_qbo = reconciler.reconcile_transfers(df, month_str)
-                write_reconcile_results(gs, transform_url, tab, df, res_qbo)
-                
-                # B. Raw Check
+                # B. Raw vs Transform Reconcile
                 if not raw_df.empty:
-                    res_raw = reconciler.reconcile_raw_vs_transform(raw_df, df, "Transfer")
+                    res_raw = reconciler.reconcile_raw_vs_transform(raw_df, df, qbo_entity, raw_index=raw_index)
                     write_raw_check_results(gs, transform_url, tab, df, res_raw)
-                
-                if any("Mismatch" in r["status"] or "Missing" in r["status"] for r in res_qbo):
-                    row_updates[COL_QBO_TR] = "QBO MISMATCH"
+
+                if _has_reconcile_issue(res_qbo):
+                    return col_name, "QBO MISMATCH", True
+                return col_name, "SYNCED", False
+            except Exception as e:
+                logger.error(f"   ❌ {label} Reconcile Error: {e}")
+                return col_name, None, True
+
+        sections = [
+            ("JV", COL_QBO_JV, tab_jv, reconciler.reconcile_journals, "JournalEntry"),
+            ("Exp", COL_QBO_EXP, tab_exp, reconciler.reconcile_expenses, "Purchase"),
+            ("Trf", COL_QBO_TR, tab_tr, reconciler.reconcile_transfers, "Transfer"),
+        ]
+
+        # Warm the access token once so worker threads don't race the refresh.
+        qbo_client.get_access_token()
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            for col_name, status, issue in executor.map(lambda s: _reconcile_section(*s), sections):
+                if status is not None:
+                    row_updates[col_name] = status
+                if issue:
                     has_issue = True
-                else:
-                    row_updates[COL_QBO_TR] = "SYNCED"
-        except Exception as e:
-            logger.error(f"   ❌ Trf Reconcile Error: {e}")
-            has_issue = True
 
         final = "DONE (Issues Found)" if has_issue else "DONE"
         row_updates[CTRL_COL_RECONCILE] = final
         row_updates["Last Sync At"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-        _batch_update_control(gs, control_sheet_id, settings.CONTROL_TAB_NAME, row_num, ctrl_df.columns, row_updates)
+        _batch_update_control(gs, control_sheet_id, CONTROL_TAB, row_num, ctrl_df.columns, row_updates)
         logger.info(f"✅ [{client_name}] Reconcile Complete: {final}")
 
 
 # ==============================================================================
 # MAIN ENTRY POINT
 # ==============================================================================
-def _is_target_client(client_row: pd.Series, target_client: str | None) -> bool:
+def _is_target_client(client_row: dict, target_client: str | None) -> bool:
     if not target_client:
         return True
 
@@ -293,6 +330,30 @@ def _target_is_all(target_client: str | None) -> bool:
     t = settings.normalize_workspace_name(target_client)
     return t in {"", "all", "*", "all clients"}
 
+def _run_one_client(client_row: dict) -> None:
+    """Runs reconciliation for one master-sheet row with its own API clients (thread-safe)."""
+    client_name = str(client_row.get(settings.MST_COL_CLIENT, "Unknown"))
+    sheet_id = str(client_row.get(settings.MST_COL_SHEET_ID, "")).strip()
+    realm_id = str(client_row.get(settings.MST_COL_REALM_ID, "")).strip()
+
+    print(f"\n🏢 RECONCILING CLIENT: {client_name} (Realm: {realm_id})")
+
+    # QBOClient.set_company mutates shared state, so each worker gets its own clients.
+    gs = GSheetsClient()
+    qbo_client = QBOClient(gs_client=gs)
+
+    client_lock_name = f"run_reconciliation_client_{realm_id}"
+    with single_instance_lock(client_lock_name) as client_acquired:
+        if not client_acquired:
+            logger.warning(
+                f"⏭️ Skipping {client_name}: another reconciliation run is already processing Realm {realm_id}."
+            )
+            return
+        try:
+            process_client_reconcile(gs, qbo_client, sheet_id, client_name, realm_id)
+        except Exception as e:
+            logger.error(f"❌ Failed client {client_name}: {e}")
+
 def main(target_client: str | None = None):
     target_is_all = _target_is_all(target_client)
     dispatch_ctx = single_instance_lock("run_reconciliation_all_dispatch") if target_is_all else nullcontext(True)
@@ -302,7 +363,6 @@ def main(target_client: str | None = None):
             return
 
         gs = GSheetsClient()
-        qbo_client = QBOClient(gs_client=gs)
 
         logger.info("🌍 Reading MASTER SHEET for Reconcile Jobs...")
         try:
@@ -314,39 +374,55 @@ def main(target_client: str | None = None):
         # Normalize headers to avoid silent misses from extra spaces/newlines in sheet columns.
         master_df.columns = [" ".join(str(c).replace("\n", " ").split()) for c in master_df.columns]
 
+        # Vectorized prefilter: active status and ID presence checked in one
+        # C-level pass instead of per-row string work inside the loop.
+        def _col(name):
+            return master_df.get(name, pd.Series("", index=master_df.index)).astype("string")
+
+        active_mask = (
+            _col(settings.MST_COL_STATUS).str.strip().str.lower().eq("active")
+            & _col(settings.MST_COL_SHEET_ID).str.strip().str.len().gt(0)
+            & _col(settings.MST_COL_REALM_ID).str.strip().str.len().gt(0)
+        ).fillna(False).astype(bool)
+
+        # Collect eligible clients, then run them concurrently (I/O-bound work).
         matched_clients = 0
-        for i, client_row in master_df.iterrows():
+        candidate_rows: list[dict] = []
+        for client_row in master_df.loc[active_mask].to_dict("records"):
             if not _is_target_client(client_row, target_client):
                 continue
             matched_clients += 1
 
             client_name = str(client_row.get(settings.MST_COL_CLIENT, "Unknown"))
-            if str(client_row.get(settings.MST_COL_STATUS, "")).strip().lower() != "active": continue
             if not settings.is_allowed_workspace(client_name):
                 logger.warning(
                     f"⚠️ Skipping {client_name}: workspace not allowed for QBO API. "
                     f"Allowed: {', '.join(settings.ALLOWED_QBO_WORKSPACES)}"
                 )
                 continue
+            candidate_rows.append(client_row)
 
-            sheet_id = str(client_row.get(settings.MST_COL_SHEET_ID, "")).strip()
-            realm_id = str(client_row.get(settings.MST_COL_REALM_ID, "")).strip()
-
-            if not sheet_id or not realm_id: continue
-
-            print(f"\n🏢 RECONCILING CLIENT: {client_name} (Realm: {realm_id})")
-
-            client_lock_name = f"run_reconciliation_client_{realm_id}"
-            with single_instance_lock(client_lock_name) as client_acquired:
-                if not client_acquired:
-                    logger.warning(
-                        f"⏭️ Skipping {client_name}: another reconciliation run is already processing Realm {realm_id}."
-                    )
-                    continue
-                try:
-                    process_client_reconcile(gs, qbo_client, sheet_id, client_name, realm_id)
-                except Exception as e:
-                    logger.error(f"❌ Failed client {client_name}: {e}")
+        try:
+            max_workers = max(1, int(os.getenv("RECONCILE_CLIENT_WORKERS", "4")))
+        except Exception:
+            max_workers = 4
+        max_workers = min(max_workers, len(candidate_rows)) or 1
+        if max_workers == 1:
+            for client_row in candidate_rows:
+                _run_one_client(client_row)
+        else:
+            logger.info(f"🧵 Reconciling {len(candidate_rows)} client(s) with {max_workers} workers...")
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                future_map = {
+                    executor.submit(_run_one_client, client_row):
+                        str(client_row.get(settings.MST_COL_CLIENT, "Unknown"))
+                    for client_row in candidate_rows
+                }
+                for future in as_completed(future_map):
+                    try:
+                        future.result()
+                    except Exception as e:
+                        logger.error(f"❌ Failed client {future_map[future]}: {e}")
 
         if target_client and matched_clients == 0:
             logger.warning(f"No client matched target '{target_client}'.")
@@ -5,7 +5,9 @@ import time
 from contextlib import nullcontext
 # --- FIX 1: Load Secrets ---
 from dotenv import load_dotenv
-load_dotenv("config/secrets.env")
+if not os.environ.get("QBO_ENV_LOADED"):
+    load_dotenv("config/secrets.env")
+    os.environ["QBO_ENV_LOADED"] = "1"
 # ---------------------------
 
 try:
@@ -14,8 +16,11 @@ try:
 except ImportError:
     pass
 
+import numpy as np
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
+from functools import lru_cache
 from config import settings
 from src.connectors.gsheets_client import GSheetsClient
 from src.connectors.qbo_client import QBOClient
@@ -44,77 +49,131 @@ def _env_float(name: str, default: float) -> float:
 SYNC_PATCH_SIZE = _env_int("QBO_SYNC_PATCH_SIZE", 10)
 QBO_SYNC_CALL_DELAY_SEC = _env_float("QBO_SYNC_CALL_DELAY_SEC", 0.35)
 QBO_SYNC_PATCH_DELAY_SEC = _env_float("QBO_SYNC_PATCH_DELAY_SEC", 0.8)
+# Concurrent QBO pushes per section. Default 1 keeps the serial, throttled
+# behavior; each worker still sleeps QBO_SYNC_CALL_DELAY_SEC per call, so the
+# aggregate rate is roughly workers / delay — raise with care around quotas.
+QBO_SYNC_PUSH_WORKERS = _env_int("QBO_SYNC_PUSH_WORKERS", 1)
 
 def _throttle_qbo_call():
     if QBO_SYNC_CALL_DELAY_SEC > 0:
         time.sleep(QBO_SYNC_CALL_DELAY_SEC)
 
-def _flush_updates(gs, spreadsheet_url, tab_name, updates: list):
+_last_stamp: tuple[int, str] = (0, "")
+
+def _now_str() -> str:
+    """'YYYY-MM-DD HH:MM:SS' timestamp, re-formatted at most once per second.
+
+    Status rows land in bursts, so most calls reuse the cached string
+    instead of paying a clock read + strftime per row.
+    """
+    global _last_stamp
+    sec = int(time.time())
+    if sec != _last_stamp[0]:
+        _last_stamp = (sec, datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+    return _last_stamp[1]
+
+def _flush_updates(gs, spreadsheet_url, tab_name, updates: list, headers: list):
     if not updates:
         return []
     logger.info(f"   >>> Flushing {len(updates)} updates to Sheet...")
-    _update_row_status_and_id(gs, spreadsheet_url, tab_name, updates)
+    _update_row_status_and_id(gs, spreadsheet_url, tab_name, updates, headers)
     if QBO_SYNC_PATCH_DELAY_SEC > 0:
         time.sleep(QBO_SYNC_PATCH_DELAY_SEC)
     return []
 
+def _submit_flush(pool, flushes: list, gs, spreadsheet_url, tab_name, updates: list, headers: list):
+    """Queues a flush on the single-thread writer pool; returns a fresh list.
+
+    Flushes serialize among themselves (and keep the patch delay) on the
+    writer thread, but the QBO push loop no longer blocks on the Sheets
+    round-trip.
+    """
+    if updates:
+        flushes.append(pool.submit(_flush_updates, gs, spreadsheet_url, tab_name, updates, headers))
+    return []
+
+@lru_cache(maxsize=64)
+def _month_label(month_str: str) -> str:
+    """'Mon YY' tab label for a control-sheet month value.
+
+    Tries the cheap strptime formats the control sheet actually uses before
+    falling back to pandas' format-inferring parser. Cached: a run sees the
+    same handful of month values across many control rows.
+    """
+    s = str(month_str).strip()
+    for fmt in ("%b %Y", "%B %Y", "%Y-%m", "%b %y"):
+        try:
+            return datetime.strptime(s, fmt).strftime("%b %y")
+        except ValueError:
+            continue
+    return pd.to_datetime(s).strftime("%b %y")
+
+def _ready_to_sync_mask(df: pd.DataFrame) -> pd.Series:
+    """Rows whose Remarks mention 'Ready to sync' (case-insensitive).
+
+    Casefold + literal contains: no regex compile and no per-section
+    object-array astype(str) copy.
+    """
+    remarks = df["Remarks"]
+    return remarks.notna() & remarks.astype("string").str.casefold().str.contains("ready to sync", regex=False)
+
+@lru_cache(maxsize=64)
+def _header_index_map(columns: tuple) -> dict[str, int]:
+    """Header name -> 1-based column index, cached per header layout."""
+    return {name: i + 1 for i, name in enumerate(columns)}
+
 def _batch_update_control(gs, sheet_id, tab_name, row_num, columns, updates_dict):
-    headers = list(columns)
-    batch_data = []
-    for col_name, val in updates_dict.items():
-        if col_name in headers:
-            col_idx = headers.index(col_name) + 1
-            batch_data.append({'row': row_num, 'col': col_idx, 'val': str(val)})
+    if not updates_dict:
+        return
+    # One vectorized get_indexer lookup instead of a list.index() scan per
+    # key; missing columns come back as -1 and are dropped.
+    col_idx = pd.Index(columns).get_indexer(list(updates_dict)) + 1
+    batch_data = [
+        {'row': row_num, 'col': int(c), 'val': str(v)}
+        for c, v in zip(col_idx, updates_dict.values())
+        if c > 0
+    ]
     if batch_data:
-        gs.batch_update_cells(sheet_id, tab_name, batch_data)
+        gs.batch_update_cells(sheet_id, tab_name, batch_data, value_input_option="RAW")
 
-def _update_row_status_and_id(gs, spreadsheet_url, tab_name, updates: list):
+def _update_row_status_and_id(gs, spreadsheet_url, tab_name, updates: list, headers: list):
     """
     Updates:
     - Remarks
     - QBO ID (raw number)
     - QBO Link (raw URL)
+
+    updates: (row_idx, status, qbo_id, qbo_link) tuples — cheaper than a
+    dict per row on large syncs.
+    headers: the tab's column names, already in memory from the section's
+    read — no extra sheet round-trip just to resolve column indices.
     """
     if not updates:
         return
 
     try:
-        df_header = gs.read_as_df(spreadsheet_url, tab_name)
-        headers = df_header.columns.tolist()
-
-        col_rem = headers.index("Remarks") + 1 if "Remarks" in headers else len(headers) + 1
-        col_id  = headers.index("QBO ID") + 1 if "QBO ID" in headers else len(headers) + 1
-        col_link = headers.index("QBO Link") + 1 if "QBO Link" in headers else len(headers) + 1
+        col_map = _header_index_map(tuple(headers))
+        col_rem = col_map.get("Remarks", len(headers) + 1)
+        col_id = col_map.get("QBO ID", len(headers) + 1)
+        col_link = col_map.get("QBO Link", len(headers) + 1)
 
         batch_payload = []
 
-        for item in updates:
-            row_no = item["row_idx"] + 2
+        for row_idx, status, qbo_id, qbo_link in updates:
+            row_no = row_idx + 2
 
             # Remarks
-            batch_payload.append({
-                "row": row_no,
-                "col": col_rem,
-                "val": item["status"]
-            })
+            batch_payload.append({"row": row_no, "col": col_rem, "val": status})
 
             # QBO ID
-            if item.get("qbo_id"):
-                batch_payload.append({
-                    "row": row_no,
-                    "col": col_id,
-                    "val": str(item["qbo_id"])
-                })
+            if qbo_id:
+                batch_payload.append({"row": row_no, "col": col_id, "val": str(qbo_id)})
 
             # QBO Link (RAW URL)
-            if item.get("qbo_link"):
-                batch_payload.append({
-                    "row": row_no,
-                    "col": col_link,
-                    "val": item["qbo_link"]
-                })
+            if qbo_link:
+                batch_payload.append({"row": row_no, "col": col_link, "val": qbo_link})
 
-        gs.batch_update_cells(spreadsheet_url, tab_name, batch_payload)
+        gs.batch_update_cells(spreadsheet_url, tab_name, batch_payload, value_input_option="RAW")
 
     except Exception as e:
         logger.error(f"Failed to update status in sheet: {e}")
@@ -138,7 +197,8 @@ def process_client_sync(
         return
 
     status_series = ctrl_df.get(settings.CTRL_COL_QBO_SYNC, pd.Series("", index=ctrl_df.index))
-    sync_now_count = int(status_series.astype(str).str.strip().eq("SYNC NOW").sum())
+    sync_mask = status_series.astype(str).str.strip().eq("SYNC NOW")
+    sync_now_count = int(sync_mask.sum())
     if sync_now_count == 0:
         logger.info(f"   ⏭️ [{client_name}] No SYNC NOW rows. Skipping QBO auth/mappings.")
         return
@@ -153,242 +213,255 @@ def process_client_sync(
 
     sync_engine = QBOSync(client=qbo_client)
 
-    COL_QBO_JV = "QBO Journal"
-    COL_QBO_EXP = "QBO Expense"
-    COL_QBO_TR = "QBO Transfer"
-
-    for i, row in ctrl_df.iterrows():
-        if str(row.get(settings.CTRL_COL_QBO_SYNC, "")).strip() != "SYNC NOW": continue
-        
-        row_num = i + 2
-        country = str(row.get(settings.CTRL_COL_COUNTRY, "")).strip()
-        transform_url = str(row.get(settings.CTRL_COL_TRANSFORM_URL, "")).strip()
-        month_str = str(row.get(settings.CTRL_COL_MONTH, "")).strip()
-        
-        if not transform_url or not month_str: continue
-
-        _batch_update_control(gs, control_sheet_id, settings.CONTROL_TAB_NAME, row_num, ctrl_df.columns, {settings.CTRL_COL_QBO_SYNC: "PROCESSING"})
+    # One writer thread per client: sheet flushes overlap the QBO pushes
+    # instead of stalling them, while still landing in order.
+    sheet_writer = ThreadPoolExecutor(max_workers=1)
+    try:
+        COL_QBO_JV = "QBO Journal"
+        COL_QBO_EXP = "QBO Expense"
+        COL_QBO_TR = "QBO Transfer"
+
+        # Rows were prefiltered by the vectorized mask above; plain dicts instead
+        # of per-row Series, and zip with the index keeps sheet row numbers right
+        # when blank rows were dropped at read time.
+        # Bind hot settings attributes to locals once; module attribute lookups
+        # are not free inside a per-row loop.
+        COL_COUNTRY = settings.CTRL_COL_COUNTRY
+        COL_TRANSFORM = settings.CTRL_COL_TRANSFORM_URL
+        COL_MONTH = settings.CTRL_COL_MONTH
+        CONTROL_TAB = settings.CONTROL_TAB_NAME
+
+        work_df = ctrl_df[sync_mask]
+        for i, row in zip(work_df.index, work_df.to_dict("records")):
+            row_num = i + 2
+            country = str(row.get(COL_COUNTRY, "")).strip()
+            transform_url = str(row.get(COL_TRANSFORM, "")).strip()
+            month_str = str(row.get(COL_MONTH, "")).strip()
         
-        has_error = False
-        jv_status, exp_status, tr_status = "Skipped", "Skipped", "Skipped"
-
-        dt_label = pd.to_datetime(month_str).strftime("%b %y")
-        tab_jv = f"{country} {dt_label} - Journals"
-        tab_exp = f"{country} {dt_label} - Expenses"
-        tab_tr = f"{country} {dt_label} - Transfers"
-
-        # ---------------------------------------------------------
-        # 1. SYNC JOURNALS
-        # ---------------------------------------------------------
-        try:
-            logger.info(f"   Using Tab: {tab_jv}")
-            try: df_jv = gs.read_as_df_sync(transform_url, tab_jv)
-            except: df_jv = pd.DataFrame()
-
-            if not df_jv.empty and "Remarks" in df_jv.columns:
-                to_sync = df_jv[df_jv["Remarks"].astype(str).str.contains("Ready to sync", case=False, na=False)]
+            if not transform_url or not month_str: continue
+
+            # No PROCESSING write here: the per-realm run lock already prevents a
+            # second syncer from picking the row up, so the transient status only
+            # cost an extra write round trip against the Sheets quota.
+            logger.info(f"   ▶️ [{client_name}] Row {row_num}: starting sync...")
+
+
+            has_error = False
+            jv_status, exp_status, tr_status = "Skipped", "Skipped", "Skipped"
+
+            dt_label = _month_label(month_str)
+            tab_jv = f"{country} {dt_label} - Journals"
+            tab_exp = f"{country} {dt_label} - Expenses"
+            tab_tr = f"{country} {dt_label} - Transfers"
+
+            # All three tabs arrive with one batchGet instead of a read per section.
+            try:
+                tab_dfs = gs.batch_read_as_df_sync(transform_url, [tab_jv, tab_exp, tab_tr])
+            except Exception as e:
+                logger.error(f"   ⚠️ Failed to batch-read transform tabs: {e}")
+                tab_dfs = {}
+
+            # ---------------------------------------------------------
+            # 1. SYNC JOURNALS
+            # ---------------------------------------------------------
+            try:
+                logger.info(f"   Using Tab: {tab_jv}")
+                df_jv = tab_dfs.get(tab_jv)
+
+                if df_jv is not None and not df_jv.empty and "Remarks" in df_jv.columns:
+                    headers_jv = df_jv.columns.tolist()
+                    to_sync = df_jv.loc[_ready_to_sync_mask(df_jv)]
                 
-                if to_sync.empty:
-                    jv_status = "SYNCED"
-                else:
-                    all_jv_nos = to_sync["Journal No"].unique().tolist()
-                    existing_docs = sync_engine.get_existing_duplicates("JournalEntry", all_jv_nos)
-                    
-                    updates = []
-                    section_fail = False
-                    
-                    for jv_no, group in to_sync.groupby("Journal No"):
-                        if str(jv_no) in existing_docs:
-                            already_synced_msg = f"Skipper (Already synced in QBO at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')})"
-                            for idx in group.index:
-                                updates.append({"row_idx": idx, "status": already_synced_msg, "qbo_id": "", "qbo_link": ""})
-                            if len(updates) >= BATCH_SIZE:
-                                updates = _flush_updates(gs, transform_url, tab_jv, updates)
-                            continue
-
-                        try:
-                            resp = sync_engine.push_journal(jv_no, group)
-                            _throttle_qbo_call()
-                            new_id = resp.get("JournalEntry", {}).get("Id", "")
-                            qbo_link = sync_engine.build_qbo_url("JournalEntry", new_id) if new_id else ""
-                            msg = f"Synced at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
-
-                            for idx in group.index:
-                                updates.append({
-                                    "row_idx": idx,
-                                    "status": msg,
-                                    "qbo_id": new_id,
-                                    "qbo_link": qbo_link
-                                })
-                        except Exception as e:
-                            msg = f"ERROR: {str(e)}"
-                            has_error = True
-                            section_fail = True
-                            _throttle_qbo_call()
-                            for idx in group.index:
-                                updates.append({"row_idx": idx, "status": msg, "qbo_id": "", "qbo_link": ""})
-
-                        if len(updates) >= BATCH_SIZE:
-                            updates = _flush_updates(gs, transform_url, tab_jv, updates)
-
-                    if updates:
-                        updates = _flush_updates(gs, transform_url, tab_jv, updates)
-                    jv_status = "SYNC FAIL" if section_fail else "SYNCED"
-        except Exception as e:
-            logger.error(f"   ❌ Journal Sync Fail: {e}")
-            has_error = True
-            jv_status = "SYNC FAIL"
-
-        # ---------------------------------------------------------
-        # 2. SYNC EXPENSES (UPDATED WITH BATCHING)
-        # ---------------------------------------------------------
-        try:
-            logger.info(f"   Using Tab: {tab_exp}")
-            try: df_exp = gs.read_as_df_sync(transform_url, tab_exp)
-            except: df_exp = pd.DataFrame()
+                    if to_sync.empty:
+                        jv_status = "SYNCED"
+                    else:
+                        jv_nos = to_sync["Journal No"].astype(str)
+                        all_jv_nos = jv_nos.unique().tolist()
+                        existing_docs = frozenset(sync_engine.get_existing_duplicates("JournalEntry", all_jv_nos))
+
+                        updates = []
+                        flushes = []
+                        section_fail = False
+
+                        # factorize + argsort hands back each journal's positional
+                        # rows directly, skipping the GroupBy machinery that
+                        # dominates when groups are small.
+                        codes, uniques = pd.factorize(jv_nos, sort=False)
+                        order = np.argsort(codes, kind="stable")
+                        splits = np.split(order, np.cumsum(np.bincount(codes))[:-1])
+
+                        def _push_journal_group(jv_no, group):
+                            """Pushes one journal. Returns (row updates, fail flag)."""
+                            if jv_no in existing_docs:
+                                already_synced_msg = f"Skipper (Already synced in QBO at {_now_str()})"
+                                return [(idx, already_synced_msg, "", "") for idx in group.index], False
 
-            if not df_exp.empty and "Remarks" in df_exp.columns:
-                to_sync = df_exp[df_exp["Remarks"].astype(str).str.contains("Ready to sync", case=False, na=False)]
-                
-                if to_sync.empty:
-                    exp_status = "SYNCED"
-                else:
-                    all_exp_nos = to_sync["Exp Ref. No"].unique().tolist()
-                    existing_docs = sync_engine.get_existing_duplicates("Purchase", all_exp_nos)
-
-                    updates = []
-                    section_fail = False
-                    total_rows = len(to_sync)
-
-                    # Use enumerate to track progress count
-                    for i, (idx, row_data) in enumerate(to_sync.iterrows()):
-                        # LOG PROGRESS to Console
-                        logger.info(f"   [Expense {i+1}/{total_rows}] Processing Ref: {row_data.get('Exp Ref. No')}...")
-
-                        ref_no = str(row_data.get("Exp Ref. No", ""))
-                        
-                        # --- Logic: Check Duplicates ---
-                        if ref_no in existing_docs:
-                            already_synced_msg = f"Skipper (Already synced in QBO at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')})"
-                            updates.append({"row_idx": idx, "status": already_synced_msg, "qbo_id": "", "qbo_link": ""})
-                        
-                        # --- Logic: Push to QBO ---
-                        else:
                             try:
-                                resp = sync_engine.push_expense(ref_no, row_data)
+                                resp = sync_engine.push_journal(jv_no, group)
                                 _throttle_qbo_call()
-                                new_id = resp.get("Purchase", {}).get("Id", "")
-                                qbo_link = sync_engine.build_qbo_url("Purchase", new_id) if new_id else ""
-                                msg = f"Synced at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
-
-                                updates.append({
-                                    "row_idx": idx,
-                                    "status": msg,
-                                    "qbo_id": new_id,
-                                    "qbo_link": qbo_link
-                                })
+                                new_id = resp.get("JournalEntry", {}).get("Id", "")
+                                qbo_link = sync_engine.build_qbo_url("JournalEntry", new_id) if new_id else ""
+                                msg = f"Synced at {_now_str()}"
+                                return [(idx, msg, new_id, qbo_link) for idx in group.index], False
                             except Exception as e:
-                                error_msg = f"ERROR: {str(e)}"
-                                logger.error(f"      -> Failed: {error_msg}")
-                                updates.append({"row_idx": idx, "status": error_msg, "qbo_id": "", "qbo_link": ""})
-                                has_error = True
-                                section_fail = True
+                                msg = f"ERROR: {str(e)}"
                                 _throttle_qbo_call()
-                        
-                        # --- NEW: BATCH UPDATE ---
-                        # If we hit the batch size, write to Sheet immediately and clear memory
-                        if len(updates) >= BATCH_SIZE:
-                            updates = _flush_updates(gs, transform_url, tab_exp, updates)
+                                return [(idx, msg, "", "") for idx in group.index], True
 
-                    # Flush any remaining updates after the loop finishes
-                    if updates:
-                        updates = _flush_updates(gs, transform_url, tab_exp, updates)
+                        groups = [(jv_no, to_sync.iloc[row_pos]) for jv_no, row_pos in zip(uniques, splits)]
 
-                    exp_status = "SYNC FAIL" if section_fail else "SYNCED"
-        except Exception as e:
-            logger.error(f"   ❌ Expense Sync Fail: {e}")
-            has_error = True
-            exp_status = "SYNC FAIL"
+                        # Each group is one independent QBO call (duplicates were
+                        # checked up front), so they overlap cleanly when push
+                        # workers are enabled. Sheet flushes stay on this thread.
+                        if QBO_SYNC_PUSH_WORKERS > 1 and len(groups) > 1:
+                            with ThreadPoolExecutor(max_workers=min(QBO_SYNC_PUSH_WORKERS, len(groups))) as pool:
+                                results = list(pool.map(lambda g: _push_journal_group(*g), groups))
+                        else:
+                            results = map(lambda g: _push_journal_group(*g), groups)
 
-        # ---------------------------------------------------------
-        # 3. SYNC TRANSFERS (UPDATED WITH BATCHING)
-        # ---------------------------------------------------------
-        try:
-            logger.info(f"   Using Tab: {tab_tr}")
-            try: df_tr = gs.read_as_df_sync(transform_url, tab_tr)
-            except: df_tr = pd.DataFrame()
+                        for group_updates, fail in results:
+                            updates.extend(group_updates)
+                            if fail:
+                                has_error = True
+                                section_fail = True
+                            if len(updates) >= BATCH_SIZE:
+                                updates = _submit_flush(sheet_writer, flushes, gs, transform_url, tab_jv, updates, headers_jv)
+
+                        updates = _submit_flush(sheet_writer, flushes, gs, transform_url, tab_jv, updates, headers_jv)
+                        for f in flushes:
+                            f.result()
+                        jv_status = "SYNC FAIL" if section_fail else "SYNCED"
+            except Exception as e:
+                logger.error(f"   ❌ Journal Sync Fail: {e}")
+                has_error = True
+                jv_status = "SYNC FAIL"
+
+            # ---------------------------------------------------------
+            # 2/3. SYNC EXPENSES & TRANSFERS (ONE PARAMETERIZED BODY)
+            # ---------------------------------------------------------
+            # The two sections were identical row-per-doc pipelines differing
+            # only in tab, ref column, QBO entity and push call.
+            def _sync_rowwise_section(label, tab, ref_col, entity, push_fn):
+                """Syncs one row-per-doc tab. Returns (status, section_fail)."""
+                logger.info(f"   Using Tab: {tab}")
+                df = tab_dfs.get(tab)
+
+                if df is None or df.empty or "Remarks" not in df.columns:
+                    return "Skipped", False
+
+                headers = df.columns.tolist()
+                to_sync = df.loc[_ready_to_sync_mask(df)]
 
-            if not df_tr.empty and "Remarks" in df_tr.columns:
-                to_sync = df_tr[df_tr["Remarks"].astype(str).str.contains("Ready to sync", case=False, na=False)]
-                
                 if to_sync.empty:
-                    tr_status = "SYNCED"
+                    return "SYNCED", False
+
+                all_nos = to_sync[ref_col].astype(str).unique().tolist()
+                existing_docs = frozenset(sync_engine.get_existing_duplicates(entity, all_nos))
+
+                updates = []
+                flushes = []
+                section_fail = False
+
+                # Plain dicts instead of the per-row Series that iterrows() would
+                # allocate; .get/[] access in the push builders works unchanged.
+                rows = list(zip(to_sync.index, to_sync.to_dict("records")))
+                total_rows = len(rows)
+
+                def _push_one(i, idx, row_data):
+                    """Pushes one row. Returns (update dict, fail flag)."""
+                    # LOG PROGRESS to Console: per-row detail only at DEBUG
+                    # (lazy %-formatting), a coarse INFO line per flush batch.
+                    if (i + 1) % BATCH_SIZE == 0 or i + 1 == total_rows:
+                        logger.info(f"   [{label}] Progress: {i+1}/{total_rows} rows")
+                    logger.debug("   [%s %d/%d] Processing Ref: %s...", label, i + 1, total_rows, row_data.get(ref_col))
+
+                    ref_no = str(row_data.get(ref_col, ""))
+
+                    # --- Logic: Check Duplicates ---
+                    if ref_no in existing_docs:
+                        already_synced_msg = f"Skipper (Already synced in QBO at {_now_str()})"
+                        return (idx, already_synced_msg, "", ""), False
+
+                    # --- Logic: Push to QBO ---
+                    try:
+                        resp = push_fn(ref_no, row_data)
+                        _throttle_qbo_call()
+                        new_id = resp.get(entity, {}).get("Id", "")
+                        qbo_link = sync_engine.build_qbo_url(entity, new_id) if new_id else ""
+                        msg = f"Synced at {_now_str()}"
+                        return (idx, msg, new_id, qbo_link), False
+                    except Exception as e:
+                        error_msg = f"ERROR: {str(e)}"
+                        logger.error(f"      -> Failed: {error_msg}")
+                        _throttle_qbo_call()
+                        return (idx, error_msg, "", ""), True
+
+                # Rows are independent QBO calls (duplicates checked up front), so
+                # they overlap when push workers are enabled. Sheet flushes stay on
+                # this thread either way.
+                if QBO_SYNC_PUSH_WORKERS > 1 and total_rows > 1:
+                    with ThreadPoolExecutor(max_workers=min(QBO_SYNC_PUSH_WORKERS, total_rows)) as pool:
+                        results = list(pool.map(lambda r: _push_one(*r), ((i, idx, rd) for i, (idx, rd) in enumerate(rows))))
                 else:
-                    all_tr_nos = to_sync["Ref No"].unique().tolist()
-                    existing_docs = sync_engine.get_existing_duplicates("Transfer", all_tr_nos)
-
-                    updates = []
-                    section_fail = False
-                    total_rows = len(to_sync)
+                    results = map(lambda r: _push_one(*r), ((i, idx, rd) for i, (idx, rd) in enumerate(rows)))
 
-                    for i, (idx, row_data) in enumerate(to_sync.iterrows()):
-                        logger.info(f"   [Transfer {i+1}/{total_rows}] Processing Ref: {row_data.get('Ref No')}...")
+                for update, fail in results:
+                    updates.append(update)
+                    section_fail = section_fail or fail
 
-                        ref_no = str(row_data.get("Ref No", ""))
-
-                        if ref_no in existing_docs:
-                            already_synced_msg = f"Skipper (Already synced in QBO at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')})"
-                            updates.append({"row_idx": idx, "status": already_synced_msg, "qbo_id": "", "qbo_link": ""})
-                        else:
-                            try:
-                                resp = sync_engine.push_transfer(row_data)
-                                _throttle_qbo_call()
-                                new_id = resp.get("Transfer", {}).get("Id", "")
-                                qbo_link = sync_engine.build_qbo_url("Transfer", new_id) if new_id else ""
-                                msg = f"Synced at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
-
-                                updates.append({
-                                    "row_idx": idx,
-                                    "status": msg,
-                                    "qbo_id": new_id,
-                                    "qbo_link": qbo_link
-                                })
-                            except Exception as e:
-                                error_msg = f"ERROR: {str(e)}"
-                                logger.error(f"      -> Failed: {error_msg}")
-                                updates.append({"row_idx": idx, "status": error_msg, "qbo_id": "", "qbo_link": ""})
-                                has_error = True
-                                section_fail = True
-                                _throttle_qbo_call()
+                    # --- NEW: BATCH UPDATE ---
+                    # If we hit the batch size, queue a write and clear memory
+                    if len(updates) >= BATCH_SIZE:
+                        updates = _submit_flush(sheet_writer, flushes, gs, transform_url, tab, updates, headers)
 
-                        # --- NEW: BATCH UPDATE ---
-                        if len(updates) >= BATCH_SIZE:
-                            updates = _flush_updates(gs, transform_url, tab_tr, updates)
+                # Flush any remaining updates and wait for queued writes to land
+                _submit_flush(sheet_writer, flushes, gs, transform_url, tab, updates, headers)
+                for f in flushes:
+                    f.result()
 
-                    if updates:
-                        updates = _flush_updates(gs, transform_url, tab_tr, updates)
+                return ("SYNC FAIL" if section_fail else "SYNCED"), section_fail
 
-                    tr_status = "SYNC FAIL" if section_fail else "SYNCED"
-        except Exception as e:
-            logger.error(f"   ❌ Transfer Sync Fail: {e}")
-            has_error = True
-            tr_status = "SYNC FAIL"
+            try:
+                exp_status, exp_fail = _sync_rowwise_section(
+                    "Expense", tab_exp, "Exp Ref. No", "Purchase",
+                    lambda ref_no, row_data: sync_engine.push_expense(ref_no, row_data),
+                )
+                has_error = has_error or exp_fail
+            except Exception as e:
+                logger.error(f"   ❌ Expense Sync Fail: {e}")
+                has_error = True
+                exp_status = "SYNC FAIL"
+
+            try:
+                tr_status, tr_fail = _sync_rowwise_section(
+                    "Transfer", tab_tr, "Ref No", "Transfer",
+                    lambda ref_no, row_data: sync_engine.push_transfer(row_data),
+                )
+                has_error = has_error or tr_fail
+            except Exception as e:
+                logger.error(f"   ❌ Transfer Sync Fail: {e}")
+                has_error = True
+                tr_status = "SYNC FAIL"
 
-        final_status = "PARTIAL ERROR" if has_error else "DONE"
+            final_status = "PARTIAL ERROR" if has_error else "DONE"
         
-        update_payload = {
-            settings.CTRL_COL_QBO_SYNC: final_status,
-            "Last Sync At": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        }
+            update_payload = {
+                settings.CTRL_COL_QBO_SYNC: final_status,
+                "Last Sync At": _now_str()
+            }
         
-        if jv_status != "Skipped": update_payload[COL_QBO_JV] = jv_status
-        if exp_status != "Skipped": update_payload[COL_QBO_EXP] = exp_status
-        if tr_status != "Skipped": update_payload[COL_QBO_TR] = tr_status
-
-        _batch_update_control(gs, control_sheet_id, settings.CONTROL_TAB_NAME, row_num, ctrl_df.columns, update_payload)
-        logger.info(f"✅ [{client_name}] Sync Complete: {final_status}")
-
-def _is_target_client(row: pd.Series, target_client: str | None) -> bool:
+            if jv_status != "Skipped": update_payload[COL_QBO_JV] = jv_status
+            if exp_status != "Skipped": update_payload[COL_QBO_EXP] = exp_status
+            if tr_status != "Skipped": update_payload[COL_QBO_TR] = tr_status
+
+            _batch_update_control(gs, control_sheet_id, CONTROL_TAB, row_num, ctrl_df.columns, update_payload)
+            logger.info(f"✅ [{client_name}] Sync Complete: {final_status}")
+    finally:
+        # Always drain the writer: a raised section/control write must
+        # not leak a non-daemon thread into the long-lived worker.
+        sheet_writer.shutdown(wait=True)
+
+def _is_target_client(row: dict, target_client: str | None) -> bool:
     if not target_client:
         return True
 
@@ -419,6 +492,30 @@ def _target_is_all(target_client: str | None) -> bool:
     t = settings.normalize_workspace_name(target_client)
     return t in {"", "all", "*", "all clients"}
 
+def _run_one_client(client_row: dict) -> None:
+    """Runs syncing for one master-sheet row with its own API clients (thread-safe)."""
+    client_name = client_row.get(settings.MST_COL_CLIENT)
+    sheet_id = client_row.get(settings.MST_COL_SHEET_ID)
+    realm_id = str(client_row.get(settings.MST_COL_REALM_ID)).strip()
+
+    logger.info(f"🏢 STARTING SYNC FOR: {client_name} ({realm_id})")
+
+    # QBOClient.set_company mutates shared state, so each worker gets its own clients.
+    gs = GSheetsClient()
+    qbo_client = QBOClient(gs_client=gs)
+
+    client_lock_name = f"run_syncing_client_{realm_id}"
+    with single_instance_lock(client_lock_name) as client_acquired:
+        if not client_acquired:
+            logger.warning(
+                f"⏭️ Skipping {client_name}: another syncing run is already processing Realm {realm_id}."
+            )
+            return
+        try:
+            process_client_sync(gs, qbo_client, sheet_id, client_name, realm_id)
+        except Exception as e:
+            logger.error(f"❌ Sync failed for {client_name}: {e}")
+
 def main(target_client: str | None = None):
     target_is_all = _target_is_all(target_client)
     dispatch_ctx = single_instance_lock("run_syncing_all_dispatch") if target_is_all else nullcontext(True)
@@ -428,7 +525,6 @@ def main(target_client: str | None = None):
             return
 
         gs = GSheetsClient()
-        qbo_client = QBOClient(gs_client=gs)
         try:
             master_df = gs.read_as_df(settings.MASTER_SHEET_ID, settings.MASTER_TAB_NAME)
         except Exception as e:
@@ -438,8 +534,10 @@ def main(target_client: str | None = None):
         # Normalize headers to avoid silent misses from extra spaces/newlines in sheet columns.
         master_df.columns = [" ".join(str(c).replace("\n", " ").split()) for c in master_df.columns]
 
+        # Collect eligible clients, then run them concurrently (I/O-bound work).
         matched_clients = 0
-        for _, row in master_df.iterrows():
+        candidate_rows: list[dict] = []
+        for row in master_df.to_dict("records"):
             if str(row.get(settings.MST_COL_STATUS, "")).strip().lower() != "active": continue
             if not _is_target_client(row, target_client):
                 continue
@@ -454,19 +552,24 @@ def main(target_client: str | None = None):
             sheet_id = row.get(settings.MST_COL_SHEET_ID)
             realm_id = str(row.get(settings.MST_COL_REALM_ID)).strip()
             if not sheet_id or not realm_id: continue
-
-            logger.info(f"🏢 STARTING SYNC FOR: {client_name} ({realm_id})")
-            client_lock_name = f"run_syncing_client_{realm_id}"
-            with single_instance_lock(client_lock_name) as client_acquired:
-                if not client_acquired:
-                    logger.warning(
-                        f"⏭️ Skipping {client_name}: another syncing run is already processing Realm {realm_id}."
-                    )
-                    continue
-                try:
-                    process_client_sync(gs, qbo_client, sheet_id, client_name, realm_id)
-                except Exception as e:
-                    logger.error(f"❌ Sync failed for {client_name}: {e}")
+            candidate_rows.append(row)
+
+        max_workers = min(_env_int("SYNC_CLIENT_WORKERS", 4), len(candidate_rows)) or 1
+        if max_workers == 1:
+            for row in candidate_rows:
+                _run_one_client(row)
+        else:
+            logger.info(f"🧵 Syncing {len(candidate_rows)} client(s) with {max_workers} workers...")
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                future_map = {
+                    executor.submit(_run_one_client, row): row.get(settings.MST_COL_CLIENT)
+                    for row in candidate_rows
+                }
+                for future in as_completed(future_map):
+                    try:
+                        future.result()
+                    except Exception as e:
+                        logger.error(f"❌ Sync failed for {future_map[future]}: {e}")
 
         if target_client and matched_clients == 0:
             logger.warning(f"No client matched target '{target_client}'.")
@@ -1,25 +1,108 @@
 from flask import Flask, request, jsonify
-import subprocess
-import sys
+import importlib
+import multiprocessing
 import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
 
 app = Flask(__name__)
 
 # --- CONFIGURATION ---
-SECRET_TOKEN = "your_secret_password_123" 
+SECRET_TOKEN = "your_secret_password_123"
 # ---------------------
 
+def _run_job(script_name, target_client=None):
+    """Runs one runner's main() inside a warm worker process.
+
+    Executes in a pool worker: the first job per worker pays the
+    pandas/gspread import cost, every later job reuses the interpreter.
+    """
+    module = importlib.import_module(script_name.removesuffix(".py"))
+    module.main(target_client=target_client)
+
+# Long-lived workers instead of a fresh `python script.py` per webhook —
+# interpreter startup plus the pandas/gspread imports cost seconds per spawn.
+# Where the platform supports it, fork workers from a forkserver that has the
+# heavy libraries preloaded, so replacement workers come up in milliseconds.
+try:
+    multiprocessing.set_forkserver_preload(["pandas", "gspread", "requests"])
+    _MP_CONTEXT = multiprocessing.get_context("forkserver")
+except ValueError:
+    _MP_CONTEXT = None  # e.g. Windows: fall back to the default start method
+
+POOL = ProcessPoolExecutor(max_workers=3, mp_context=_MP_CONTEXT)
+
+# Backpressure: cap queued jobs so a webhook flood cannot pile up unbounded
+# work behind the three workers; saturated requests get a 503 to retry.
+_MAX_PENDING = 16
+_pending_jobs: set = set()
+_pending_lock = threading.Lock()
+
+def _job_done(future):
+    with _pending_lock:
+        _pending_jobs.discard(future)
+
 def run_script_in_background(script_name, target_client=None):
-    """Runs a Python script, optionally filtering by client."""
-    cmd = [sys.executable, script_name]
-    if target_client:
-        cmd.extend(["--client", target_client])  # Pass client name as argument
-        
-    try:
-        print(f"   ▶️  Starting {script_name} for '{target_client or 'ALL'}'...")
-        subprocess.Popen(cmd) 
-    except Exception as e:
-        print(f"   ❌ Error running {script_name}: {e}")
+    """Runs a runner script in the worker pool, optionally filtering by client.
+
+    Returns False when the job queue is saturated (caller should 503).
+    """
+    with _pending_lock:
+        if len(_pending_jobs) >= _MAX_PENDING:
+            print(f"   🚦 Job queue full ({_MAX_PENDING} pending); rejecting {script_name}.")
+            return False
+        try:
+            print(f"   ▶️  Starting {script_name} for '{target_client or 'ALL'}'...")
+            future = POOL.submit(_run_job, script_name, target_client)
+        except Exception as e:
+            print(f"   ❌ Error running {script_name}: {e}")
+            return True
+        _pending_jobs.add(future)
+    future.add_done_callback(_job_done)
+    return True
+
+# Debounce: identical triggers arriving in a burst (AppScript often fires the
+# same event several times in a second) coalesce into a single run. Each
+# webhook just refreshes the key's deadline; the dispatcher thread launches
+# the job once the burst has been quiet for the debounce window.
+_DEBOUNCE_SEC = 5.0
+_MAX_QUEUED_TRIGGERS = 128
+_EVENT_SCRIPTS = {
+    'pipeline_trigger': 'run_ingestion.py',
+    'sync_trigger': 'run_syncing.py',
+    'reconcile_trigger': 'run_reconciliation.py',
+}
+_pending_triggers: dict[tuple, float] = {}
+_trigger_lock = threading.Lock()
+
+def _queue_trigger(event_type, target_client):
+    """Registers/refreshes a debounced trigger. False when the queue is full."""
+    key = (event_type, str(target_client or ""))
+    with _trigger_lock:
+        if key not in _pending_triggers and len(_pending_triggers) >= _MAX_QUEUED_TRIGGERS:
+            return False
+        _pending_triggers[key] = time.monotonic() + _DEBOUNCE_SEC
+    return True
+
+def _dispatch_loop():
+    while True:
+        time.sleep(0.5)
+        now = time.monotonic()
+        due = []
+        with _trigger_lock:
+            for key, deadline in list(_pending_triggers.items()):
+                if deadline <= now:
+                    due.append(key)
+                    del _pending_triggers[key]
+        for key in due:
+            event_type, target = key
+            if not run_script_in_background(_EVENT_SCRIPTS[event_type], target or None):
+                # Pool saturated: push the trigger back for a later cycle.
+                with _trigger_lock:
+                    _pending_triggers.setdefault(key, time.monotonic() + _DEBOUNCE_SEC)
+
+_dispatcher = threading.Thread(target=_dispatch_loop, daemon=True, name="webhook-dispatcher")
+_dispatcher.start()
 
 @app.route('/webhook', methods=['POST'])
 def webhook_listener():
@@ -54,28 +137,18 @@ def webhook_listener():
 
     # 3. Handle Events
     
-    # --- CASE A: TRANSFORM / INGESTION ---
-    if event_type == 'pipeline_trigger':
-        # Pass the client name to the function
-        thread = threading.Thread(target=run_script_in_background, args=("run_ingestion.py", target_client))
-        thread.start()
-        return jsonify({"status": "success", "message": f"Ingestion started for {target_client}"}), 200
-
-    # --- CASE B: SYNCING ---
-    elif event_type == 'sync_trigger':
-        thread = threading.Thread(target=run_script_in_background, args=("run_syncing.py", target_client))
-        thread.start()
-        return jsonify({"status": "success", "message": "Syncing started"}), 200
-
-    # --- CASE C: RECONCILIATION ---
-    elif event_type == 'reconcile_trigger':
-        thread = threading.Thread(target=run_script_in_background, args=("run_reconciliation.py", target_client))
-        thread.start()
-        return jsonify({"status": "success", "message": "Reconciliation started"}), 200
+    # Triggers are debounced: repeated events for the same target within the
+    # window fold into one run launched by the dispatcher thread.
+    if event_type in _EVENT_SCRIPTS:
+        if not _queue_trigger(event_type, target_client):
+            return jsonify({"status": "error", "message": "Server busy, retry later"}), 503
+        return jsonify({"status": "success", "message": f"{event_type} queued for {target_client or 'ALL'}"}), 200
 
     return jsonify({"status": "ignored", "message": "Unknown event type"}), 200
 
 if __name__ == '__main__':
+    # Dev fallback only. In production run the module through Gunicorn:
+    #   gunicorn -c gunicorn.conf.py server:app
     print("-------------------------------------------------------")
-    print(f"🚀 Server listening for Webhooks...")
+    print(f"🚀 Server listening for Webhooks (dev server)...")
     app.run(host='0.0.0.0', port=8000)
@@ -81,6 +81,9 @@ def _upsert_master_row(
     sh = gs.open(settings.MASTER_SHEET_ID)
     ws = sh.worksheet(settings.MASTER_TAB_NAME)
 
+    # Bounded reads: the header row plus the Realm ID column are all this
+    # function needs, so avoid pulling the whole tab (which includes every
+    # client's refresh token) over the wire.
     headers = ws.row_values(1)
     if not headers:
         raise RuntimeError("Master Sheet tab has no headers in row 1.")
@@ -98,18 +101,18 @@ def _upsert_master_row(
         raise RuntimeError(f"Missing required Master Sheet columns: {missing}")
 
     col_idx = {h: headers.index(h) + 1 for h in headers}
-    all_values = ws.get_all_values()
 
-    target_row = None
-    realm_col = col_idx[settings.MST_COL_REALM_ID] - 1
-    for i, row in enumerate(all_values[1:], start=2):
-        val = row[realm_col].strip() if realm_col < len(row) else ""
-        if val == realm_id:
-            target_row = i
-            break
+    # Index realm -> sheet row once instead of scanning every row per lookup.
+    # setdefault keeps the first occurrence, matching the old scan's behavior
+    # when a realm ID appears twice.
+    realm_values = ws.col_values(col_idx[settings.MST_COL_REALM_ID])
+    realm_to_row: dict[str, int] = {}
+    for i, val in enumerate(realm_values[1:], start=2):
+        realm_to_row.setdefault(val.strip(), i)
+    target_row = realm_to_row.get(realm_id)
 
     if target_row is None:
-        target_row = len(all_values) + 1
+        target_row = len(realm_values) + 1
         row_payload = [""] * len(headers)
         if client_name:
             row_payload[col_idx[settings.MST_COL_CLIENT] - 1] = client_name
@@ -133,13 +136,19 @@ def _upsert_master_row(
             (target_row, col_idx[settings.MST_COL_REFRESH_TOKEN], refresh_token),
         ]
     )
-    for r, c, v in updates:
-        ws.update_cell(r, c, v)
+    # One batched write instead of up to five serial update_cell round-trips.
+    gs.batch_update_cells(
+        settings.MASTER_SHEET_ID,
+        settings.MASTER_TAB_NAME,
+        [{"row": r, "col": c, "val": v} for r, c, v in updates],
+    )
     return ("updated", target_row)
 
 
 def main() -> int:
-    load_dotenv("config/secrets.env")
+    if not os.environ.get("QBO_ENV_LOADED"):
+        load_dotenv("config/secrets.env")
+        os.environ["QBO_ENV_LOADED"] = "1"
 
     parser = argparse.ArgumentParser(
         description="Initial QBO setup: authorize app, get realmId + refresh token, optionally save to Master Sheet."
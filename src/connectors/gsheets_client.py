@@ -2,13 +2,14 @@ from __future__ import annotations
 
 import os
 import re
+import threading
 import time
 import random
 import json
 import requests
 import pandas as pd
 from config import settings
-from gspread.utils import rowcol_to_a1
+from gspread.utils import rowcol_to_a1, numericise
 from gspread.exceptions import APIError
 
 from google.oauth2.credentials import Credentials
@@ -80,6 +81,24 @@ class GSheetsClient:
         
         self.creds = creds
         self.gc = gspread.authorize(creds)
+        # Pooled session for the raw Drive API helpers (gspread pools its own).
+        self._drive_session = requests.Session()
+        # Resolved folder IDs: (parent_id, folder_name) -> folder_id. Folders
+        # are never moved/renamed by this bot, so IDs stay valid per process.
+        self._folder_cache: dict[tuple[str, str], str] = {}
+        # Short-lived read cache for read_as_df_sync: (sheet_id, tab) -> (ts, df).
+        # Writes through this client drop the spreadsheet's cached tabs.
+        self._sync_read_cache: dict[tuple[str, str], tuple[float, pd.DataFrame]] = {}
+        self._sync_read_cache_ttl = 60.0
+        # Sections run this client from worker threads; the lock keeps
+        # concurrent reads/writes/invalidations of the cache dict safe.
+        self._read_cache_lock = threading.Lock()
+
+    def _invalidate_read_cache(self, spreadsheet_url_or_id: str):
+        sid = _extract_sheet_id(spreadsheet_url_or_id)
+        with self._read_cache_lock:
+            for key in [k for k in self._sync_read_cache if k[0] == sid]:
+                self._sync_read_cache.pop(key, None)
 
     # --- DRIVE API HELPERS ---
     def _get_drive_headers(self):
@@ -95,34 +114,81 @@ class GSheetsClient:
         """
         Checks if 'folder_name' exists inside 'parent_id'.
         If yes, returns its ID. If no, creates it and returns new ID.
+        Resolved IDs are cached, so repeat calls cost no Drive roundtrips.
         """
+        cached = self._folder_cache.get((parent_id, folder_name))
+        if cached:
+            return cached
+
         headers = self._get_drive_headers()
-        
+
         # 1. Search for existing folder
         query = f"'{parent_id}' in parents and name = '{folder_name}' and mimeType = 'application/vnd.google-apps.folder' and trashed = false"
         url = f"https://www.googleapis.com/drive/v3/files?q={query}"
-        
-        resp = requests.get(url, headers=headers)
+
+        resp = self._drive_session.get(url, headers=headers)
         if resp.status_code == 200:
             files = resp.json().get('files', [])
             if files:
                 print(f"   📂 Found existing folder '{folder_name}' ({files[0]['id']})")
+                self._folder_cache[(parent_id, folder_name)] = files[0]['id']
                 return files[0]['id']
-        
+
         # 2. Create if not found
         print(f"   Ez Creating new folder '{folder_name}' inside {parent_id}...")
+        new_id = self._create_folder(parent_id, folder_name, headers)
+        self._folder_cache[(parent_id, folder_name)] = new_id
+        return new_id
+
+    def _create_folder(self, parent_id: str, folder_name: str, headers: dict) -> str:
         create_url = "https://www.googleapis.com/drive/v3/files"
         payload = {
             "name": folder_name,
             "mimeType": "application/vnd.google-apps.folder",
             "parents": [parent_id]
         }
-        resp = requests.post(create_url, headers=headers, json=payload)
+        resp = self._drive_session.post(create_url, headers=headers, json=payload)
         if resp.status_code == 200:
-            new_id = resp.json().get('id')
-            return new_id
-        else:
-            raise Exception(f"Failed to create folder: {resp.text}")
+            return resp.json().get('id')
+        raise Exception(f"Failed to create folder: {resp.text}")
+
+    def ensure_folders_exist(self, parent_id: str, folder_names: list[str]) -> dict[str, str]:
+        """
+        Bulk ensure_folder_exists: resolves all 'folder_names' under
+        'parent_id' with ONE search query (OR filter on the names), then
+        creates only the missing ones. Returns {name: folder_id}.
+        """
+        resolved = {}
+        missing = []
+        for name in folder_names:
+            cached = self._folder_cache.get((parent_id, name))
+            if cached:
+                resolved[name] = cached
+            else:
+                missing.append(name)
+        if not missing:
+            return resolved
+
+        headers = self._get_drive_headers()
+        name_filter = " or ".join(f"name = '{n}'" for n in missing)
+        query = f"'{parent_id}' in parents and ({name_filter}) and mimeType = 'application/vnd.google-apps.folder' and trashed = false"
+        resp = self._drive_session.get(
+            "https://www.googleapis.com/drive/v3/files",
+            headers=headers, params={"q": query, "fields": "files(id,name)"},
+        )
+        if resp.status_code == 200:
+            for f in resp.json().get('files', []):
+                if f['name'] not in resolved:
+                    resolved[f['name']] = f['id']
+                    self._folder_cache[(parent_id, f['name'])] = f['id']
+
+        for name in missing:
+            if name not in resolved:
+                print(f"   Ez Creating new folder '{name}' inside {parent_id}...")
+                new_id = self._create_folder(parent_id, name, headers)
+                self._folder_cache[(parent_id, name)] = new_id
+                resolved[name] = new_id
+        return resolved
 
     def move_file_to_folder(self, file_id: str, folder_id: str):
         """Moves a file into a specific folder (by adding parent, removing old parents)."""
@@ -130,12 +196,12 @@ class GSheetsClient:
         
         # 1. Get current parents
         get_url = f"https://www.googleapis.com/drive/v3/files/{file_id}?fields=parents"
-        resp = requests.get(get_url, headers=headers)
+        resp = self._drive_session.get(get_url, headers=headers)
         current_parents = ",".join(resp.json().get('parents', []))
         
         # 2. Move
         move_url = f"https://www.googleapis.com/drive/v3/files/{file_id}?addParents={folder_id}&removeParents={current_parents}"
-        resp = requests.patch(move_url, headers=headers)
+        resp = self._drive_session.patch(move_url, headers=headers)
         
         if resp.status_code == 200:
             print(f"   🚚 Moved file {file_id} -> Folder {folder_id}")
@@ -149,7 +215,7 @@ class GSheetsClient:
         return self.gc.open_by_key(sid)
 
     @retry_with_backoff()
-    def read_as_df(self, spreadsheet_url_or_id: str, tab_name: str, header_row: int = 1, value_render_option: str = 'FORMATTED_VALUE') -> pd.DataFrame:
+    def read_as_df(self, spreadsheet_url_or_id: str, tab_name: str, header_row: int = 1, value_render_option: str = 'FORMATTED_VALUE', range_a1: str | None = None) -> pd.DataFrame:
         sh = self.open(spreadsheet_url_or_id)
         try:
             ws = sh.worksheet(tab_name)
@@ -157,28 +223,144 @@ class GSheetsClient:
             print(f"⚠️ Warning: Tab '{tab_name}' not found. Returning empty DataFrame.")
             return pd.DataFrame()
 
-        values = ws.get_all_values(value_render_option=value_render_option)
+        if range_a1:
+            # Bounded range (e.g. "A:Z") so only the needed columns cross the wire.
+            values = ws.get(range_a1, value_render_option=value_render_option)
+            if values:
+                # Ranged gets return ragged rows; pad like get_all_values does.
+                width = max(len(r) for r in values)
+                values = [r + [""] * (width - len(r)) for r in values]
+        else:
+            values = ws.get_all_values(value_render_option=value_render_option)
         if not values: return pd.DataFrame()
 
         header_idx = header_row - 1
         if header_idx >= len(values): return pd.DataFrame()
 
         header = values[header_idx]
-        data = values[header_idx + 1 :]
-        
-        df = pd.DataFrame(data, columns=header)
-        df = df.replace("", pd.NA).dropna(how="all")
+        # Drop all-blank rows at list level instead of the replace/dropna
+        # double walk over the built frame. Keep the original positions as
+        # index labels: callers map sheet row = index + header_row + 1.
+        data, index = [], []
+        for pos, row in enumerate(values[header_idx + 1 :]):
+            if any(row):
+                data.append(row)
+                index.append(pos)
+
+        df = pd.DataFrame(data, columns=header, index=index)
+        # One vectorized pass NA-masks the remaining blank cells; downstream
+        # code leans on isna/fillna semantics for empties.
+        df = df.where(df != "")
         return df
     
+    @retry_with_backoff()
+    def batch_read_as_df(
+        self,
+        spreadsheet_url_or_id: str,
+        tab_names: list[str],
+        header_row: int = 1,
+        value_render_option: str = 'FORMATTED_VALUE',
+    ) -> dict[str, pd.DataFrame]:
+        """Reads several tabs with one values.batchGet round trip.
+
+        Returns {tab_name: DataFrame}; missing tabs map to empty DataFrames.
+        """
+        out = {tab: pd.DataFrame() for tab in tab_names}
+        if not tab_names:
+            return out
+
+        sh = self.open(spreadsheet_url_or_id)
+        existing = {ws.title for ws in sh.worksheets()}
+        wanted = [t for t in tab_names if t in existing]
+        for missing in [t for t in tab_names if t not in existing]:
+            print(f"⚠️ Warning: Tab '{missing}' not found. Returning empty DataFrame.")
+        if not wanted:
+            return out
+
+        resp = sh.values_batch_get(
+            [f"'{t}'" for t in wanted],
+            params={"valueRenderOption": value_render_option},
+        )
+        header_idx = header_row - 1
+        for tab, value_range in zip(wanted, resp.get("valueRanges", [])):
+            values = value_range.get("values", [])
+            if not values or header_idx >= len(values):
+                continue
+            # batchGet returns ragged rows; pad to a rectangle like get_all_values does.
+            width = max(len(r) for r in values)
+            norm = [r + [""] * (width - len(r)) for r in values]
+            df = pd.DataFrame(norm[header_idx + 1 :], columns=norm[header_idx])
+            out[tab] = df.replace("", pd.NA).dropna(how="all")
+        return out
+
     @retry_with_backoff()
     def read_as_df_sync(self, spreadsheet_url_or_id: str, tab_name: str) -> pd.DataFrame:
+        sid = _extract_sheet_id(spreadsheet_url_or_id)
+        with self._read_cache_lock:
+            cached = self._sync_read_cache.get((sid, tab_name))
+        if cached and time.time() - cached[0] < self._sync_read_cache_ttl:
+            return cached[1].copy()
+
         sh = self.open(spreadsheet_url_or_id)
         try:
             ws = sh.worksheet(tab_name)
         except Exception:
             return pd.DataFrame()
         values = ws.get_all_records()
-        return pd.DataFrame(values)
+        df = pd.DataFrame(values)
+        # Cache a copy so callers can mutate their frame freely.
+        with self._read_cache_lock:
+            self._sync_read_cache[(sid, tab_name)] = (time.time(), df.copy())
+        return df
+
+    @retry_with_backoff()
+    def batch_read_as_df_sync(self, spreadsheet_url_or_id: str, tab_names: list[str]) -> dict[str, pd.DataFrame | None]:
+        """read_as_df_sync semantics for several tabs in one batchGet.
+
+        Values are numericised like get_all_records and the index stays
+        positional, so row_idx + 2 remains the sheet row. Fresh entries in
+        the read cache are reused; tabs that are missing or hold no data
+        rows map to None rather than a sentinel empty DataFrame.
+        """
+        out: dict[str, pd.DataFrame | None] = dict.fromkeys(tab_names)
+        if not tab_names:
+            return out
+
+        sid = _extract_sheet_id(spreadsheet_url_or_id)
+        now = time.time()
+        to_fetch = []
+        for tab in tab_names:
+            with self._read_cache_lock:
+                cached = self._sync_read_cache.get((sid, tab))
+            if cached and now - cached[0] < self._sync_read_cache_ttl:
+                out[tab] = cached[1].copy()
+            else:
+                to_fetch.append(tab)
+        if not to_fetch:
+            return out
+
+        sh = self.open(spreadsheet_url_or_id)
+        existing = {ws.title for ws in sh.worksheets()}
+        wanted = [t for t in to_fetch if t in existing]
+        if not wanted:
+            return out
+
+        resp = sh.values_batch_get([f"'{t}'" for t in wanted])
+        for tab, value_range in zip(wanted, resp.get("valueRanges", [])):
+            values = value_range.get("values", [])
+            if len(values) < 2:
+                continue
+            header = values[0]
+            width = len(header)
+            rows = [
+                [numericise(c) for c in (r + [""] * (width - len(r)))[:width]]
+                for r in values[1:]
+            ]
+            df = pd.DataFrame(rows, columns=header)
+            out[tab] = df
+            with self._read_cache_lock:
+                self._sync_read_cache[(sid, tab)] = (time.time(), df.copy())
+        return out
 
     @retry_with_backoff()
     def create_spreadsheet(self, title: str) -> str:
@@ -207,32 +389,107 @@ class GSheetsClient:
         
     @retry_with_backoff()
     def update_cell(self, spreadsheet_url_or_id: str, tab_name: str, row: int, col: int, value: str):
+        self._invalidate_read_cache(spreadsheet_url_or_id)
         sh = self.open(spreadsheet_url_or_id)
         ws = sh.worksheet(tab_name)
         cell_address = rowcol_to_a1(row, col)
         ws.update(range_name=cell_address, values=[[str(value)]], value_input_option="USER_ENTERED")
 
     @retry_with_backoff()
-    def batch_update_cells(self, spreadsheet_url_or_id: str, tab_name: str, updates: list[dict]):
+    def batch_update_cells(self, spreadsheet_url_or_id: str, tab_name: str, updates: list[dict],
+                           value_input_option: str = "USER_ENTERED"):
         if not updates: return
+        self._invalidate_read_cache(spreadsheet_url_or_id)
         sh = self.open(spreadsheet_url_or_id)
         ws = sh.worksheet(tab_name)
-        batch_payload = []
+
+        # Group by row and fuse runs of adjacent columns into one range each,
+        # so a typical status-row update ships as a single contiguous write
+        # instead of one payload entry per cell. Duplicate cells keep the
+        # last value, matching the server's last-write-wins behavior.
+        by_row: dict[int, dict[int, str]] = {}
         for u in updates:
-            a1_notation = rowcol_to_a1(u['row'], u['col'])
-            batch_payload.append({'range': a1_notation, 'values': [[str(u['val'])]]})
-        ws.batch_update(batch_payload, value_input_option="USER_ENTERED")
+            by_row.setdefault(u['row'], {})[u['col']] = str(u['val'])
+
+        runs = []  # (row, start_col, end_col, row_values)
+        for row in sorted(by_row):
+            cells = by_row[row]
+            cols = sorted(cells)
+            start = prev = cols[0]
+            run_vals = [cells[start]]
+            for col in cols[1:]:
+                if col == prev + 1:
+                    run_vals.append(cells[col])
+                    prev = col
+                    continue
+                runs.append((row, start, prev, run_vals))
+                start = prev = col
+                run_vals = [cells[col]]
+            runs.append((row, start, prev, run_vals))
+
+        # Fuse vertically too: consecutive rows covering the same column span
+        # stack into one rectangular range, so a status batch that touches the
+        # same columns on adjacent rows ships as a single values entry.
+        runs.sort(key=lambda r: (r[1], r[2], r[0]))
+        batch_payload = []
+        block = None
+        for row, start, end, vals in runs:
+            if block and block['start'] == start and block['end'] == end and row == block['last_row'] + 1:
+                block['values'].append(vals)
+                block['last_row'] = row
+                continue
+            if block:
+                batch_payload.append({
+                    'range': f"{rowcol_to_a1(block['first_row'], block['start'])}:{rowcol_to_a1(block['last_row'], block['end'])}",
+                    'values': block['values'],
+                })
+            block = {'first_row': row, 'last_row': row, 'start': start, 'end': end, 'values': [vals]}
+        if block:
+            batch_payload.append({
+                'range': f"{rowcol_to_a1(block['first_row'], block['start'])}:{rowcol_to_a1(block['last_row'], block['end'])}",
+                'values': block['values'],
+            })
+        # Cap request size: very large result writes (one range per row) can
+        # trip the API's payload limit and trigger costly server-side retries.
+        chunk_size = 5000
+        for i in range(0, len(batch_payload), chunk_size):
+            ws.batch_update(batch_payload[i:i + chunk_size], value_input_option=value_input_option)
 
     @retry_with_backoff()
     def delete_rows(self, spreadsheet_url_or_id: str, tab_name: str, row_indices: list[int]):
         if not row_indices: return
+        self._invalidate_read_cache(spreadsheet_url_or_id)
         sh = self.open(spreadsheet_url_or_id)
         try: ws = sh.worksheet(tab_name)
         except Exception: return
-        sorted_rows = sorted(list(set(row_indices)), reverse=True)
-        for row_num in sorted_rows:
-            try: ws.delete_rows(row_num)
-            except Exception: pass
+        # Fuse sorted rows into contiguous runs and delete them in one
+        # batchUpdate call instead of one API roundtrip per row. Ranges are
+        # built descending so earlier deletions never shift later indices.
+        sorted_rows = sorted(set(row_indices), reverse=True)
+        ranges = []  # (start_row, end_row) inclusive, 1-based
+        run_start = run_end = sorted_rows[0]
+        for row_num in sorted_rows[1:]:
+            if row_num == run_start - 1:
+                run_start = row_num
+            else:
+                ranges.append((run_start, run_end))
+                run_start = run_end = row_num
+        ranges.append((run_start, run_end))
+        sh.batch_update({
+            "requests": [
+                {
+                    "deleteDimension": {
+                        "range": {
+                            "sheetId": ws.id,
+                            "dimension": "ROWS",
+                            "startIndex": start - 1,
+                            "endIndex": end,
+                        }
+                    }
+                }
+                for start, end in ranges
+            ]
+        })
 
     @retry_with_backoff()
     def cleanup_default_sheet(self, spreadsheet_url_or_id: str):
@@ -249,6 +506,7 @@ class GSheetsClient:
                             template_tab_name: str | None = None, 
                             template_spreadsheet_id: str | None = None) -> None:
         if df is None or df.empty: return
+        self._invalidate_read_cache(spreadsheet_url_or_id)
         target_sh = self.open(spreadsheet_url_or_id)
         target_sid = target_sh.id
         try:
@@ -281,4 +539,79 @@ class GSheetsClient:
                 ws.update("A1", values)
                 return
 
-        ws.append_rows(data_values, value_input_option="USER_ENTERED")
\ No newline at end of file
+        ws.append_rows(data_values, value_input_option="USER_ENTERED")
+
+    @retry_with_backoff()
+    def append_or_create_dfs(self, spreadsheet_url_or_id: str, jobs: list[tuple],
+                             template_spreadsheet_id: str | None = None) -> None:
+        """Appends several DataFrames to their tabs in one metadata pass.
+
+        jobs: (tab_name, df, template_tab_name) triples. The spreadsheet is
+        opened once and its worksheets listed once; missing tabs are created
+        (from the template when available), then a single values.batchGet
+        finds each tab's last data row and a single values.batchUpdate lands
+        every append.
+        """
+        jobs = [(tab, df, templ) for tab, df, templ in jobs if df is not None and not df.empty]
+        if not jobs:
+            return
+        self._invalidate_read_cache(spreadsheet_url_or_id)
+        target_sh = self.open(spreadsheet_url_or_id)
+        target_sid = target_sh.id
+        ws_by_title = {ws.title: ws for ws in target_sh.worksheets()}
+
+        template_sh = None
+        append_jobs = []  # (tab_name, data_values)
+        for tab_name, df, template_tab_name in jobs:
+            df_export = df.astype(object).where(pd.notnull(df), None)
+            data_values = df_export.values.tolist()
+
+            if tab_name in ws_by_title:
+                append_jobs.append((tab_name, data_values))
+                continue
+
+            created_from_template = False
+            if template_tab_name and template_spreadsheet_id:
+                try:
+                    if template_sh is None:
+                        template_sh = self.open(template_spreadsheet_id)
+                    source_ws = template_sh.worksheet(template_tab_name)
+                    copy_res = source_ws.copy_to(target_sid)
+                    ws = target_sh.get_worksheet_by_id(copy_res['sheetId'])
+                    ws.update_title(tab_name)
+                    created_from_template = True
+                except Exception: pass
+
+            if created_from_template:
+                ws_by_title[tab_name] = ws
+                append_jobs.append((tab_name, data_values))
+            else:
+                rows = max(len(df) + 1, 100)
+                cols = max(len(df.columns), 26)
+                ws = target_sh.add_worksheet(title=tab_name, rows=rows, cols=cols)
+                ws.update("A1", [df.columns.tolist()] + data_values)
+
+        if not append_jobs:
+            return
+
+        # One batchGet resolves every tab's last data row.
+        resp = target_sh.values_batch_get([f"'{t}'" for t, _ in append_jobs])
+        payload = []
+        grow_requests = []
+        for (tab_name, data_values), vr in zip(append_jobs, resp.get("valueRanges", [])):
+            next_row = len(vr.get("values", [])) + 1
+            ws = ws_by_title[tab_name]
+            shortfall = next_row - 1 + len(data_values) - ws.row_count
+            if shortfall > 0:
+                # values.batchUpdate does not grow the grid like append does.
+                grow_requests.append({
+                    "appendDimension": {"sheetId": ws.id, "dimension": "ROWS", "length": shortfall}
+                })
+            payload.append({'range': f"'{tab_name}'!A{next_row}", 'values': data_values})
+
+        if grow_requests:
+            target_sh.batch_update({"requests": grow_requests})
+        target_sh.values_batch_update({
+            "valueInputOption": "USER_ENTERED",
+            "data": payload,
+        })
\ No newline at end of file
@@ -4,6 +4,7 @@ import os
 import time
 import random
 import requests
+from requests.adapters import HTTPAdapter
 import urllib.parse  # <--- ADD THIS IMPORT
 import pandas as pd
 from typing import Optional, Any, Dict
@@ -33,6 +34,17 @@ class QBOClient:
         # Cache the Master Sheet row index for the current realm to speed up writes
         self._master_sheet_row_idx: int | None = None
 
+        # Per-run memo of max journal numbers, keyed by (realm_id, prefix).
+        # Cleared when the company context switches.
+        self._max_jv_cache: dict[tuple[str, str], int] = {}
+
+        # Pooled HTTP session: reuses TCP/TLS connections across QBO calls
+        # instead of paying a handshake per request.
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=10)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+
     def set_company(self, realm_id: str):
         """
         Switches context to a specific company.
@@ -43,7 +55,8 @@ class QBOClient:
         self._workspace_authorized = False
         self.access_token = None # Clear old access token
         self.token_expiry = 0.0
-        
+        self._max_jv_cache.clear()
+
         print(f"🔄 [QBOClient] Switching context to Realm ID: {self.realm_id}")
         self._load_auth_from_sheet()
 
@@ -133,7 +146,7 @@ class QBOClient:
         }
         data = {"grant_type": "refresh_token", "refresh_token": self.refresh_token}
         
-        resp = requests.post(settings.QBO_TOKEN_URL, headers=headers, data=data, timeout=60)
+        resp = self._session.post(settings.QBO_TOKEN_URL, headers=headers, data=data, timeout=60)
         if resp.status_code != 200:
             print(f"❌ QBO Auth Failed: {resp.text}")
             resp.raise_for_status()
@@ -177,9 +190,9 @@ class QBOClient:
         for attempt in range(1, max_attempts + 1):
             try:
                 if method.lower() == 'get':
-                    resp = requests.get(url, headers=self._headers(), timeout=60, **kwargs)
+                    resp = self._session.get(url, headers=self._headers(), timeout=60, **kwargs)
                 elif method.lower() == 'post':
-                    resp = requests.post(url, headers=self._headers(), timeout=60, **kwargs)
+                    resp = self._session.post(url, headers=self._headers(), timeout=60, **kwargs)
                 else:
                     raise ValueError(f"Unsupported HTTP method: {method}")
 
@@ -306,16 +319,23 @@ class QBOClient:
         return None
 
     def get_max_journal_number(self, prefix: str) -> int:
+        cache_key = (self.realm_id, prefix)
+        if cache_key in self._max_jv_cache:
+            return self._max_jv_cache[cache_key]
+
         query = f"SELECT DocNumber FROM JournalEntry WHERE DocNumber LIKE '{prefix}%' ORDER BY DocNumber DESC MAXRESULTS 1"
         try:
             results = self.query(query)
-            if not results: return 0
-            doc_num = str(results[0].get("DocNumber", ""))
-            if doc_num.startswith(prefix):
-                suffix = doc_num[len(prefix):]
-                clean_suffix = "".join(filter(str.isdigit, suffix))
-                return int(clean_suffix) if clean_suffix else 0
-            return 0
+            max_no = 0
+            if results:
+                doc_num = str(results[0].get("DocNumber", ""))
+                if doc_num.startswith(prefix):
+                    suffix = doc_num[len(prefix):]
+                    clean_suffix = "".join(filter(str.isdigit, suffix))
+                    max_no = int(clean_suffix) if clean_suffix else 0
+            self._max_jv_cache[cache_key] = max_no
+            return max_no
         except Exception as e:
+            # Failures are not cached so a retry re-queries QBO.
             print(f"⚠️ Failed to fetch max journal number: {e}")
             return 0
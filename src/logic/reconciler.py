@@ -362,16 +362,30 @@ class Reconciler:
         return updates
 
     # --- 4. RAW vs TRANSFORM RECONCILE (FIXED) ---
-    def reconcile_raw_vs_transform(self, raw_df: pd.DataFrame, transform_df: pd.DataFrame, entity_type: str) -> list[dict]:
+    def prepare_raw_index(self, raw_df: pd.DataFrame) -> dict[int, float]:
+        """
+        Cleans and keys the raw frame once: {No: abs(USD - QBO)}.
+        The same raw_df is compared against all three transform tabs, so the
+        caller builds this once and passes it to reconcile_raw_vs_transform.
+        """
+        if raw_df.empty or "No" not in raw_df.columns:
+            return {}
+        keys = pd.to_numeric(raw_df["No"], errors="coerce").fillna(0).astype(int)
+        if "USD - QBO" in raw_df.columns:
+            amts = raw_df["USD - QBO"].map(self._safe_float).abs()
+        else:
+            amts = pd.Series(0.0, index=raw_df.index)
+        # First occurrence wins, matching the old .loc[no_val] behavior.
+        mask = (keys > 0) & ~keys.duplicated(keep="first")
+        return dict(zip(keys[mask].tolist(), amts[mask].tolist()))
+
+    def reconcile_raw_vs_transform(self, raw_df: pd.DataFrame, transform_df: pd.DataFrame, entity_type: str, raw_index: dict[int, float] | None = None) -> list[dict]:
         updates = []
-        if raw_df.empty or "No" not in raw_df.columns: 
+        if raw_index is None:
+            raw_index = self.prepare_raw_index(raw_df)
+        if not raw_index:
             logger.warning("⚠️ Raw Comparison Skipped: Empty DataFrame or missing 'No' column")
             return []
-        
-        # 1. Clean & Index Raw
-        raw_clean = raw_df.copy()
-        raw_clean["_Key"] = pd.to_numeric(raw_clean["No"], errors="coerce").fillna(0).astype(int)
-        raw_clean = raw_clean[raw_clean["_Key"] > 0].set_index("_Key")
 
         # 2. Group Transform (Aggregate Max Abs Value)
         transform_df["_Key"] = pd.to_numeric(transform_df["No"], errors="coerce").fillna(0).astype(int)
@@ -390,16 +404,12 @@ class Reconciler:
         mismatch_count = 0
         
         for no_val, sheet_amt in transform_agg.items():
-            if no_val not in raw_clean.index:
+            # --- FIX: STRICTLY use "USD - QBO" from Raw (pre-keyed above) ---
+            raw_abs = raw_index.get(no_val)
+            if raw_abs is None:
                 status_map[no_val] = "Unmatched: Missing in Raw"
                 continue
 
-            raw_row = raw_clean.loc[no_val]
-            
-            # --- FIX: STRICTLY use "USD - QBO" from Raw ---
-            final_raw_val = raw_row.get("USD - QBO", 0)
-            
-            raw_abs = abs(self._safe_float(final_raw_val))
             sheet_abs = abs(self._safe_float(sheet_amt))
 
             if abs(raw_abs - sheet_abs) > 0.05:
@@ -2,12 +2,16 @@ from __future__ import annotations
 import pandas as pd
 import re
 import difflib
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from src.utils.logger import setup_logger
 from src.connectors.qbo_client import QBOClient
 
+import os
 from dotenv import load_dotenv
-load_dotenv("config/secrets.env")
+if not os.environ.get("QBO_ENV_LOADED"):
+    load_dotenv("config/secrets.env")
+    os.environ["QBO_ENV_LOADED"] = "1"
 
 logger = setup_logger("syncing_logic")
 
@@ -236,19 +240,27 @@ class QBOSync:
         clean_docs = list(set([str(d).strip() for d in doc_nums if str(d).strip()]))
         
         if entity_type in ["JournalEntry", "Purchase"]:
-            chunk_size = 50 
-            for i in range(0, len(clean_docs), chunk_size):
-                chunk = clean_docs[i:i+chunk_size]
+            chunk_size = 50
+            chunks = [clean_docs[i:i+chunk_size] for i in range(0, len(clean_docs), chunk_size)]
+
+            def _query_chunk(chunk):
                 safe_chunk = [d.replace("'", "\\'") for d in chunk]
                 formatted_list = "', '".join(safe_chunk)
-                
+
                 query = f"SELECT DocNumber FROM {entity_type} WHERE DocNumber IN ('{formatted_list}')"
                 try:
-                    results = self.client.query(query)
-                    for item in results:
-                        existing.add(item.get("DocNumber"))
+                    return [item.get("DocNumber") for item in self.client.query(query)]
                 except Exception as e:
                     logger.error(f"⚠️ Failed duplicate check {entity_type}: {e}")
+                    return []
+
+            if len(chunks) > 1:
+                # Independent read-only queries; overlap the round-trips.
+                with ThreadPoolExecutor(max_workers=min(4, len(chunks))) as pool:
+                    for found in pool.map(_query_chunk, chunks):
+                        existing.update(found)
+            elif chunks:
+                existing.update(_query_chunk(chunks[0]))
 
         elif entity_type == "Transfer":
             try:
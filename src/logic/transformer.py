@@ -5,8 +5,11 @@ import pandas as pd
 import numpy as np
 import difflib
 from config import settings
+from src.utils.logger import setup_logger
 import re
 
+logger = setup_logger("transformer")
+
 # --- CONSTANTS ---
 DEFAULT_JV_PREFIX = "KZO-JV"
 DEFAULT_DOC_PREFIX = "KZO"
@@ -97,7 +100,8 @@ def find_id_in_map(mapping_dict: dict, search_name: str) -> str | None:
     # Checks "Fixed Assets:Equipment" == "Fixed Assets:Equipment"
     for qbo_name, qbo_id in mapping_dict.items():
         if qbo_name.lower() == search_lower: 
-            print(f"   ✅ [Mapping] EXACT: '{search_name}' -> '{qbo_name}'")
+            # Hot path: %-style args so formatting only runs at DEBUG level.
+            logger.debug("   ✅ [Mapping] EXACT: '%s' -> '%s'", search_name, qbo_name)
             return qbo_id
     
     # --- STRATEGY 2: LEAF NODE MATCH (Split by :) ---
@@ -120,10 +124,10 @@ def find_id_in_map(mapping_dict: dict, search_name: str) -> str | None:
     
     if matches:
         best_match = matches[0]
-        print(f"   ✨ [Mapping] FUZZY (80%): '{search_name}' -> '{best_match}'")
+        logger.info("   ✨ [Mapping] FUZZY (80%%): '%s' -> '%s'", search_name, best_match)
         return mapping_dict[best_match]
 
-    print(f"   ❌ [Mapping] FAILED: Could not find '{search_name}'")
+    logger.warning("   ❌ [Mapping] FAILED: Could not find '%s'", search_name)
     return None
 
 def _fix_grp_location(df: pd.DataFrame, col_name: str = "Location"):
@@ -243,7 +247,7 @@ class TransformResult:
 # 1. PROCESS JOURNALS
 # ==========================================
 def process_journals(df: pd.DataFrame, start_no: int, qbo_mappings: Dict[str, dict], existing_ids: Dict[int, str] = None, client_name: str = "") -> tuple[pd.DataFrame, int]:
-    print(f"\n--- DEBUG: Processing JOURNALS (Input Rows: {len(df)}) ---")
+    logger.debug("--- Processing JOURNALS (Input Rows: %d) ---", len(df))
     SPECIAL_CASE = 'Reclass'
     
     if df.empty: return pd.DataFrame(), start_no
@@ -553,7 +557,7 @@ def process_journals(df: pd.DataFrame, start_no: int, qbo_mappings: Dict[str, di
 # ==========================================
 def process_expenses(df: pd.DataFrame, country: str,
                      start_no: int, qbo_mappings: Dict[str, dict], existing_ids: Dict[int, str] = None, client_name: str = "") -> Tuple[pd.DataFrame, int]:
-    print(f"\n--- DEBUG: Processing EXPENSES (Input Rows: {len(df)}) ---")
+    logger.debug("--- Processing EXPENSES (Input Rows: %d) ---", len(df))
     if df is None or df.empty: return pd.DataFrame(), start_no
     if existing_ids is None: existing_ids = {}
 
@@ -561,7 +565,7 @@ def process_expenses(df: pd.DataFrame, country: str,
     d = df[df[COL_USD].round(2) != 0].copy()
     
     if len(df) != len(d):
-        print(f"      ⚠️ Dropped {len(df) - len(d)} rows due to 0.00 amount.")
+        logger.info("      ⚠️ Dropped %d rows due to 0.00 amount.", len(df) - len(d))
         
     if d.empty: return pd.DataFrame(), start_no
 
@@ -649,9 +653,9 @@ def process_expenses(df: pd.DataFrame, country: str,
     map_acc = qbo_mappings.get('accounts', {})
     map_loc = qbo_mappings.get('locations', {})
     
-    # DEBUG: Log account mappings for troubleshooting
+    # Log account mappings for troubleshooting
     if not map_acc:
-        print(f"   ⚠️ WARNING: No accounts in QBO mappings for country={country}. Check realm ID.")
+        logger.warning("   ⚠️ No accounts in QBO mappings for country=%s. Check realm ID.", country)
 
     def validate_expense_row(row):
         row_no = row.get("No", "")
@@ -713,7 +717,7 @@ def process_expenses(df: pd.DataFrame, country: str,
 # ==========================================
 def process_transfers(df: pd.DataFrame, country: str,
                       start_no: int, qbo_mappings: Dict[str, dict], existing_ids: Dict[int, str] = None, client_name: str = "") -> tuple[pd.DataFrame, int]:
-    print(f"\n--- DEBUG: Processing TRANSFERS (Input Rows: {len(df)}) ---")
+    logger.debug("--- Processing TRANSFERS (Input Rows: %d) ---", len(df))
     if df.empty: return pd.DataFrame(), start_no
     if existing_ids is None: existing_ids = {}
 
@@ -784,9 +788,9 @@ def process_transfers(df: pd.DataFrame, country: str,
     map_acc = qbo_mappings.get('accounts', {})
     map_loc = qbo_mappings.get('locations', {})
     
-    # DEBUG: Log account mappings for troubleshooting
+    # Log account mappings for troubleshooting
     if not map_acc:
-        print(f"   ⚠️ WARNING: No accounts in QBO mappings for country={country}. Check realm ID.")
+        logger.warning("   ⚠️ No accounts in QBO mappings for country=%s. Check realm ID.", country)
     
     def validate_transfer_row(row):
         row_no = row.get("No", "")